@@ -0,0 +1,323 @@
+"""Caches used by the services, over a pluggable storage backend.
+
+Each module-level :class:`TTLCache` is one namespace. ``CACHE_BACKEND`` picks where
+the entries live:
+
+* ``memory`` (default): a per-process LRU with per-entry expiry. Invalidations
+  only reach the worker that made them, so with several workers the TTLs bound how
+  long another worker can serve an old value.
+* ``sqlite``: one SQLite file (``CACHE_PATH``) shared by every worker process on
+  the host. Entries and invalidations are seen by all workers at once, so a write
+  handled by one worker is never answered from another worker's stale copy.
+
+Async endpoints read and fill caches on the event loop, so the SQLite backend
+never waits for its file lock there: reads in WAL mode do not take it, and a fill
+that finds it held is dropped. Only invalidations wait, and those run on write
+paths, which use the threadpool or job threads.
+
+Writers invalidate after their transaction commits. A reader that computed a value
+from rows read before that commit must not store it afterwards, so readers take
+:meth:`TTLCache.generation` before querying and pass it to :meth:`TTLCache.set`,
+which drops the value if the namespace was invalidated in between.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from contextlib import contextmanager
+from typing import Any
+
+from app.config import settings
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """Process-local LRU of at most ``max_entries`` entries across all namespaces."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[(namespace, key)]
+                return _MISSING
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def set(
+        self, namespace: str, key: Hashable, value: Any, ttl: float, since: int | None = None
+    ) -> None:
+        with self._lock:
+            if since is not None and self._generations.get(namespace, 0) != since:
+                return
+            self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        self.delete_many(namespace, (key,))
+
+    def delete_many(self, namespace: str, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop((namespace, key), None)
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            for entry in [entry for entry in self._entries if entry[0] == namespace]:
+                del self._entries[entry]
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class SQLiteBackend:
+    """Entries in a SQLite file shared by the worker processes of one host.
+
+    Values are pickled, so anyone able to write the file could run code in the
+    API. The file and its directory must belong to the user running the API and
+    not be writable by anyone else; otherwise the backend refuses to start.
+    Expired entries are purged every ``PURGE_EVERY`` writes.
+    """
+
+    PURGE_EVERY = 1000
+    # How long setup and invalidations wait for another process's write lock
+    LOCK_TIMEOUT_MS = 5000
+
+    def __init__(self, path: str):
+        self.path = path
+        _check_private(os.path.dirname(os.path.abspath(path)))
+        if os.path.lexists(path):
+            _check_private(path)
+        self._local = threading.local()
+        self._writes = 0
+        with self._waiting() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_generations ("
+                "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL) WITHOUT ROWID"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in a forked child
+        pid, connection = getattr(self._local, "connection", (None, None))
+        if pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.LOCK_TIMEOUT_MS / 1000, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Losing cache writes on a crash is harmless
+            connection.execute("PRAGMA synchronous=OFF")
+            # From here on a locked file fails at once instead of blocking the caller
+            connection.execute("PRAGMA busy_timeout=0")
+            self._local.connection = (os.getpid(), connection)
+        return connection
+
+    @contextmanager
+    def _waiting(self):
+        """This thread's connection, waiting up to ``LOCK_TIMEOUT_MS`` for locks."""
+        connection = self._connection()
+        connection.execute(f"PRAGMA busy_timeout={self.LOCK_TIMEOUT_MS}")
+        try:
+            yield connection
+        finally:
+            connection.execute("PRAGMA busy_timeout=0")
+
+    def get(self, namespace: str, key: Hashable) -> Any:
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, repr(key)),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Busy (e.g. WAL recovery in another process): treat as a miss
+            return _MISSING
+        if row is None or row[1] <= time.time():
+            return _MISSING
+        return pickle.loads(row[0])
+
+    def generation(self, namespace: str) -> int:
+        try:
+            row = self._connection().execute(
+                "SELECT generation FROM cache_generations WHERE namespace = ?", (namespace,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Matches no stored generation, so the caller's fill is dropped
+            return -1
+        return row[0] if row else 0
+
+    def set(
+        self, namespace: str, key: Hashable, value: Any, ttl: float, since: int | None = None
+    ) -> None:
+        # The generation check and the write are one statement, so an invalidation
+        # from another process cannot slip in between
+        connection = self._connection()
+        try:
+            self._fill(connection, namespace, key, value, ttl, since)
+        except sqlite3.OperationalError:
+            # Another process holds the write lock; skip this fill rather than wait
+            return
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            try:
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+                )
+            except sqlite3.OperationalError:
+                pass
+
+    @staticmethod
+    def _fill(connection, namespace, key, value, ttl, since) -> None:
+        connection.execute(
+            "INSERT INTO cache_entries (namespace, key, value, expires_at) "
+            "SELECT ?, ?, ?, ? WHERE ? IS NULL OR ? = coalesce("
+            "(SELECT generation FROM cache_generations WHERE namespace = ?), 0) "
+            "ON CONFLICT (namespace, key) DO UPDATE "
+            "SET value = excluded.value, expires_at = excluded.expires_at",
+            (
+                namespace,
+                repr(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                time.time() + ttl,
+                since,
+                since,
+                namespace,
+            ),
+        )
+
+    def _invalidate(self, namespace: str, statement: str, parameters: list[tuple]) -> None:
+        # Unlike fills, an invalidation must not be lost, so it waits for the lock
+        with self._waiting() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(statement, parameters)
+                connection.execute(
+                    "INSERT INTO cache_generations (namespace, generation) VALUES (?, 1) "
+                    "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1",
+                    (namespace,),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def delete(self, namespace: str, key: Hashable) -> None:
+        self.delete_many(namespace, (key,))
+
+    def delete_many(self, namespace: str, keys: Iterable[Hashable]) -> None:
+        """Drop ``keys`` in one transaction, with a single generation bump."""
+        self._invalidate(
+            namespace,
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            [(namespace, repr(key)) for key in keys],
+        )
+
+    def clear(self, namespace: str) -> None:
+        self._invalidate(
+            namespace, "DELETE FROM cache_entries WHERE namespace = ?", [(namespace,)]
+        )
+
+
+def _check_private(path: str) -> None:
+    """Refuse ``path`` unless it is ours and only we can write to it."""
+    if not hasattr(os, "getuid"):
+        return
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode):
+        raise RuntimeError(f"Cache path {path} is a symlink")
+    if info.st_uid != os.getuid():
+        raise RuntimeError(f"Cache path {path} is owned by another user")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise RuntimeError(f"Cache path {path} is writable by other users")
+
+
+def default_cache_path() -> str:
+    """A cache file per database, so two deployments on one host never share entries.
+
+    It lives in a 0700 directory of the current user under the temp directory,
+    which other local users can neither read nor pre-create files in.
+    """
+    user = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    directory = os.path.join(tempfile.gettempdir(), f"hrms-cache-{user}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    digest = hashlib.sha1(settings.DATABASE_URL.encode()).hexdigest()[:12]
+    return os.path.join(directory, f"{digest}.db")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(settings.CACHE_BACKEND)
+    return _backend
+
+
+def create_backend(name: str):
+    if name == "memory":
+        return MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    if name == "sqlite":
+        return SQLiteBackend(settings.CACHE_PATH or default_cache_path())
+    raise ValueError(f"Unknown CACHE_BACKEND {name!r}; choose memory or sqlite")
+
+
+def set_backend(backend) -> None:
+    """Replace the backend of every cache (benchmarks compare them in one process)."""
+    global _backend
+    _backend = backend
+
+
+class TTLCache:
+    """A namespace of cached values that expire after ``ttl`` seconds."""
+
+    def __init__(self, namespace: str, ttl: float):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = get_backend().get(self.namespace, key)
+        return default if value is _MISSING else value
+
+    def generation(self) -> int:
+        """Token for :meth:`set`; it changes whenever the namespace is invalidated."""
+        return get_backend().generation(self.namespace)
+
+    def set(self, key: Hashable, value: Any, since: int | None = None) -> None:
+        """Store ``value`` unless ``since`` is given and the namespace was invalidated after it."""
+        if self.ttl <= 0:
+            return
+        get_backend().set(self.namespace, key, value, self.ttl, since)
+
+    def invalidate(self, key: Hashable) -> None:
+        get_backend().delete(self.namespace, key)
+
+    def clear(self) -> None:
+        get_backend().clear(self.namespace)
@@ -0,0 +1,159 @@
+"""Maintenance commands, run from the backend directory as ``python -m app.cli``."""
+
+import argparse
+import sys
+from datetime import date
+
+from app.database import SessionLocal, init_engines
+from app.imports import read_csv_rows
+from app.query_plans import check_query_plans
+from app.services.import_service import ImportService
+from app.services.partition_service import PartitionService
+from app.services.rollup_service import RollupService
+
+
+def rebuild_rollup(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        rows = RollupService(db).rebuild(args.date_from, args.date_to)
+    finally:
+        db.close()
+    print(f"Rebuilt daily attendance rollup: {rows} rows written")
+
+
+def check_indexes(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        plans = check_query_plans(db)
+    finally:
+        db.close()
+
+    for plan in plans:
+        print(f"[{'ok' if plan.uses_index else 'FULL SCAN'}] {plan.name}")
+        if args.verbose or not plan.uses_index:
+            for line in plan.plan:
+                print(f"    {line}")
+    if not all(plan.uses_index for plan in plans):
+        sys.exit(1)
+
+
+def import_csv(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            service = ImportService(db, batch_size=args.batch_size)
+            importer = getattr(service, f"import_{args.kind}")
+            report = importer(read_csv_rows(stream))
+    finally:
+        db.close()
+
+    print(
+        f"Imported {args.kind}: {report['processed']} rows processed, "
+        f"{report['created']} created, {report['failed']} failed"
+    )
+    for error in report["errors"]:
+        print(f"    row {error['row']}: {error['error']}")
+    if report["failed"]:
+        sys.exit(1)
+
+
+def _partition_command(action):
+    db = SessionLocal()
+    try:
+        return action(PartitionService(db))
+    except (NotImplementedError, ValueError) as exc:
+        sys.exit(str(exc))
+    finally:
+        db.close()
+
+
+def partition_attendance(args: argparse.Namespace) -> None:
+    created = _partition_command(lambda service: service.partition_table(args.months_ahead))
+    print(f"Partitioned attendance into {len(created)} partitions")
+
+
+def ensure_partitions(args: argparse.Namespace) -> None:
+    def ensure(service: PartitionService):
+        service.require_partitioned()
+        return service.ensure_months(args.date_from, args.months_ahead), service.partitions()
+
+    created, partitions = _partition_command(ensure)
+    for partition in partitions:
+        bounds = f"{partition.lower} .. {partition.upper}" if partition.lower else "default"
+        marker = "+" if partition.name in created else " "
+        print(f"{marker} {partition.name:<28} {bounds}")
+    print(f"Created {len(created)} partitions")
+
+
+def archive_attendance(args: argparse.Namespace) -> None:
+    def archive(service: PartitionService):
+        years = args.years or service.archivable_years(args.before)
+        return [(year, service.archive_year(year)) for year in years]
+
+    for year, rows in _partition_command(archive):
+        print(f"Archived {year}: {rows} rows" if rows else f"{year} is already archived")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="HRMS Lite maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollup", help="Recompute daily_attendance_rollup from attendance"
+    )
+    rebuild.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    rebuild.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    rebuild.set_defaults(handler=rebuild_rollup)
+
+    importer = commands.add_parser("import", help="Bulk import a CSV file")
+    importer.add_argument("kind", choices=["employees", "attendance"])
+    importer.add_argument("path", help="CSV file with a header row")
+    importer.add_argument("--batch-size", type=int, default=2000)
+    importer.set_defaults(handler=import_csv)
+
+    check = commands.add_parser(
+        "check-indexes", help="EXPLAIN service queries and fail on full table scans"
+    )
+    check.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    check.set_defaults(handler=check_indexes)
+
+    partition = commands.add_parser(
+        "partition-attendance",
+        help="Convert attendance into monthly range partitions (PostgreSQL)",
+    )
+    partition.add_argument("--months-ahead", type=int)
+    partition.set_defaults(handler=partition_attendance)
+
+    ensure = commands.add_parser(
+        "ensure-partitions",
+        help="Create upcoming monthly partitions and list them (PostgreSQL)",
+    )
+    ensure.add_argument(
+        "--from", dest="date_from", type=date.fromisoformat,
+        help="also create months from this date, moving their rows out of the default partition",
+    )
+    ensure.add_argument("--months-ahead", type=int)
+    ensure.set_defaults(handler=ensure_partitions)
+
+    archive = commands.add_parser(
+        "archive-attendance",
+        help="Merge closed years into compact yearly archive partitions (PostgreSQL)",
+    )
+    archive.add_argument("years", nargs="*", type=int, help="years to archive")
+    archive.add_argument(
+        "--before", type=int, default=date.today().year - 1,
+        help="without explicit years, archive every year before this one (default: last year)",
+    )
+    archive.set_defaults(handler=archive_attendance)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    init_engines()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
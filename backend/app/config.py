@@ -1,16 +1,89 @@
 import os
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
+# backend/.env for local development. Deployments set the environment directly
+# and never import python-dotenv.
+_ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+if _ENV_FILE.is_file():
+    from dotenv import load_dotenv
+
+    load_dotenv(_ENV_FILE)
 
 
 class Settings:
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", "sqlite:///./hrms.db"
     )
+    # Comma-separated read replicas of DATABASE_URL; GET requests are spread over
+    # them, everything else uses the primary
+    DATABASE_REPLICA_URLS: list[str] = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    # After a write, a client's reads stay on the primary this many seconds so it
+    # sees its own changes despite replication lag
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
     CORS_ORIGINS: list[str] = os.getenv(
         "CORS_ORIGINS", "http://localhost:5173,http://localhost:3000"
     ).split(",")
 
+    # Serve read endpoints through an async engine (aiosqlite / asyncpg)
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+    # Connection pool (PostgreSQL)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Per-connection PRAGMAs (SQLite)
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Negative values are KiB, so the default is a 64 MiB page cache
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+    # Where the service caches live: "memory" (per process) or "sqlite" (one file
+    # shared by every worker on the host, so invalidations reach all of them)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    # File for the sqlite cache backend; defaults to one per DATABASE_URL in the
+    # system temp directory
+    CACHE_PATH: str = os.getenv("CACHE_PATH", "")
+    # Entries the memory backend keeps before evicting the least recently used
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+    # Seconds dashboard stats are cached; 0 disables caching
+    DASHBOARD_CACHE_TTL: int = int(os.getenv("DASHBOARD_CACHE_TTL", "60"))
+    # Seconds an employee's packed attendance history is cached for the stats
+    # endpoint; any attendance write moves readers to a fresh entry
+    ATTENDANCE_STATS_CACHE_TTL: int = int(os.getenv("ATTENDANCE_STATS_CACHE_TTL", "300"))
+    # Seconds a worker trusts its cached table versions when answering
+    # If-None-Match; with the memory cache backend this bounds how long another
+    # worker's write can go unnoticed
+    TABLE_VERSION_CACHE_TTL: float = float(os.getenv("TABLE_VERSION_CACHE_TTL", "1"))
+
+    # Threads per worker process running background jobs (?background=true)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    # Each worker refreshes the heartbeat of its unfinished jobs this often; jobs
+    # whose worker sent none for JOB_STALE_SECONDS are marked failed as orphaned
+    JOB_HEARTBEAT_SECONDS: float = float(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+    JOB_STALE_SECONDS: int = int(os.getenv("JOB_STALE_SECONDS", "120"))
+
+    # PostgreSQL attendance partitioning (python -m app.cli partition-attendance):
+    # months of partitions kept ready ahead of today, and an optional tablespace
+    # for the yearly archive partitions
+    ATTENDANCE_PARTITION_MONTHS_AHEAD: int = int(
+        os.getenv("ATTENDANCE_PARTITION_MONTHS_AHEAD", "3")
+    )
+    ATTENDANCE_ARCHIVE_TABLESPACE: str = os.getenv("ATTENDANCE_ARCHIVE_TABLESPACE", "")
+
+    # Request latency and SQL statement metrics, served at /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Log statements slower than this many milliseconds with the service method
+    # that issued them; 0 disables slow-query logging
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+    # Flag requests that run the same statement this many times (likely N+1);
+    # 0 disables the check
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+
 
 settings = Settings()
@@ -1,18 +1,264 @@
-from sqlalchemy import create_engine
+import importlib
+import itertools
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed during a write and, with synchronous=NORMAL, only
+    # fsyncs at checkpoints; busy_timeout makes writers from other workers wait
+    # for the lock instead of failing with "database is locked". SQLite ignores
+    # foreign keys (and so ON DELETE CASCADE) unless each connection enables them.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+
+def _set_sqlite_query_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(url: str, read_only: bool = False):
+    """Engine for ``url``; ``read_only`` engines (replicas) reject writes."""
+    if make_url(url).get_backend_name() == "sqlite":
+        db_engine = create_engine(url)
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+        if read_only:
+            event.listen(db_engine, "connect", _set_sqlite_query_only)
+        return db_engine
+
+    options = {"execution_options": {"postgresql_readonly": True}} if read_only else {}
+    return create_engine(url, **_pool_options(), **options)
+
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def create_async_db_engine(url: str, read_only: bool = False):
+    """Async counterpart of :func:`create_db_engine` (aiosqlite / asyncpg)."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=_ASYNC_DRIVERS[backend])
+    if backend == "sqlite":
+        db_engine = create_async_engine(url)
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        if read_only:
+            event.listen(db_engine.sync_engine, "connect", _set_sqlite_query_only)
+        return db_engine
+
+    options = {"execution_options": {"postgresql_readonly": True}} if read_only else {}
+    return create_async_engine(url, **_pool_options(), **options)
+
+
+# The session factories exist from import, but the engines behind them are only
+# created by init_engines() (the API's lifespan, the CLI), so importing the app
+# neither reads the schema nor loads database drivers.
+engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Only built when DB_ASYNC is enabled; read endpoints then run on the event loop
+async_engine = None
+AsyncSessionLocal = (
+    async_sessionmaker(autoflush=False, expire_on_commit=False) if settings.DB_ASYNC else None
+)
+
+# Read replicas. Their sessions are tagged so services do not fill the shared
+# caches from data that may lag behind the primary.
+replica_engines = []
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, info={"replica": True})
+    for _ in settings.DATABASE_REPLICA_URLS
+]
+async_replica_engines = []
+AsyncReplicaSessionLocals = [
+    async_sessionmaker(autoflush=False, expire_on_commit=False, info={"replica": True})
+    for _ in (settings.DATABASE_REPLICA_URLS if settings.DB_ASYNC else ())
+]
+_next_replica = itertools.count()
+_init_lock = threading.Lock()
+
+
+def init_engines() -> None:
+    """Create the engines and bind the session factories to them. Idempotent."""
+    global engine, async_engine
+    with _init_lock:
+        if engine is not None:
+            return
+        for url, factory in zip(settings.DATABASE_REPLICA_URLS, ReplicaSessionLocals):
+            replica = create_db_engine(url, read_only=True)
+            replica_engines.append(replica)
+            factory.configure(bind=replica)
+        for url, factory in zip(settings.DATABASE_REPLICA_URLS, AsyncReplicaSessionLocals):
+            replica = create_async_db_engine(url, read_only=True)
+            async_replica_engines.append(replica)
+            factory.configure(bind=replica)
+        if AsyncSessionLocal is not None:
+            async_engine = create_async_db_engine(settings.DATABASE_URL)
+            AsyncSessionLocal.configure(bind=async_engine)
+        primary = create_db_engine(settings.DATABASE_URL)
+        SessionLocal.configure(bind=primary)
+        # Set last: a non-None engine means everything above is bound
+        engine = primary
+
+
+def sync_engines() -> list:
+    """Every engine created by :func:`init_engines`, async ones as their sync engines."""
+    engines = [engine, *replica_engines]
+    if async_engine is not None:
+        engines.append(async_engine.sync_engine)
+    engines.extend(replica.sync_engine for replica in async_replica_engines)
+    return engines
 
 Base = declarative_base()
 
+# Set on responses to writes; holds the time until which the client reads from
+# the primary
+STICKY_COOKIE = "hrms_primary_until"
+_READ_METHODS = {"GET", "HEAD"}
+
+
+def is_replica(db) -> bool:
+    """True for sessions bound to a read replica (sync or async)."""
+    return db.info.get("replica", False)
 
-def get_db():
-    db = SessionLocal()
+
+def stick_to_primary(response: Response) -> None:
+    """Send the client's reads to the primary for the next ``REPLICA_STICKY_SECONDS``."""
+    if not settings.DATABASE_REPLICA_URLS:
+        return
+    until = time.time() + settings.REPLICA_STICKY_SECONDS
+    response.set_cookie(
+        STICKY_COOKIE,
+        f"{until:.3f}",
+        max_age=int(settings.REPLICA_STICKY_SECONDS) + 1,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _route_to_replica(request: Request, response: Response) -> bool:
+    """Decide whether ``request`` may read from a replica.
+
+    Writes go to the primary and mark the client sticky, so its reads for the
+    next ``REPLICA_STICKY_SECONDS`` also go to the primary and see the write.
+    """
+    if not settings.DATABASE_REPLICA_URLS:
+        return False
+    if request.method not in _READ_METHODS:
+        stick_to_primary(response)
+        return False
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) < time.time()
+    except ValueError:
+        return True
+
+
+def get_db(request: Request, response: Response):
+    """Session on a replica for reads that may use one, on the primary otherwise."""
+    if _route_to_replica(request, response):
+        factory = ReplicaSessionLocals[next(_next_replica) % len(ReplicaSessionLocals)]
+    else:
+        factory = SessionLocal
+    db = factory()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request, response: Response):
+    """Session for ``async def`` endpoints, routed like :func:`get_db`.
+
+    Yields an :class:`AsyncSession` when ``DB_ASYNC`` is enabled. Otherwise yields
+    a regular ``Session``, which the async services drive from the threadpool.
+    """
+    replica = _route_to_replica(request, response)
+    if AsyncSessionLocal is None:
+        if replica:
+            factory = ReplicaSessionLocals[next(_next_replica) % len(ReplicaSessionLocals)]
+        else:
+            factory = SessionLocal
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+
+    if replica:
+        factory = AsyncReplicaSessionLocals[next(_next_replica) % len(AsyncReplicaSessionLocals)]
+    else:
+        factory = AsyncSessionLocal
+    async with factory() as db:
+        yield db
+
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def chunked(items: list, size: int = IN_CLAUSE_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Imported on first use: the PostgreSQL dialect package alone adds ~100 ms to startup
+_ON_CONFLICT_DIALECTS = {"postgresql", "sqlite"}
+
+
+def on_conflict_insert(db, table):
+    """Return the dialect's INSERT construct, which supports ON CONFLICT clauses."""
+    dialect = db.get_bind().dialect.name
+    if dialect not in _ON_CONFLICT_DIALECTS:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
+    return importlib.import_module(f"sqlalchemy.dialects.{dialect}").insert(table)
+
+
+def integrity_violation(exc: IntegrityError) -> tuple[str, str]:
+    """Classify an ``IntegrityError`` raised by SQLite or PostgreSQL.
+
+    Returns ``(kind, target)``: ``kind`` is "unique", "foreign_key" or "other";
+    ``target`` is the violated constraint name on PostgreSQL or the column list on
+    SQLite (e.g. "employees.email"), so callers can match on its suffix.
+    """
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if code:
+        diag = getattr(orig, "diag", None)
+        target = getattr(diag, "constraint_name", None) or getattr(orig, "constraint_name", "")
+        kinds = {"23505": "unique", "23503": "foreign_key"}
+        return kinds.get(code, "other"), target or ""
+
+    message = str(orig)
+    kind, _, target = message.partition(" constraint failed")
+    if kind.startswith("UNIQUE"):
+        return "unique", target.lstrip(": ")
+    if kind.startswith("FOREIGN KEY"):
+        return "foreign_key", target.lstrip(": ")
+    return "other", message
@@ -0,0 +1,80 @@
+"""Incremental encoders for attendance exports.
+
+Each encoder consumes an async iterator of row batches and yields bytes as soon
+as a batch is encoded, so an export never holds more than one batch in memory.
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+
+async def encode_csv(columns: Sequence[str], batches: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose contents are taken out after every row group."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+async def encode_parquet(
+    columns: Sequence[str], batches: AsyncIterator[list]
+) -> AsyncIterator[bytes]:
+    """One Parquet row group per batch. Requires the optional ``pyarrow`` package."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "id": pa.int64(),
+        "employee_id": pa.string(),
+        "employee_name": pa.string(),
+        "date": pa.date32(),
+        "status": pa.string(),
+        "created_at": pa.timestamp("us"),
+    }
+    schema = pa.schema([(name, types[name]) for name in columns])
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for batch in batches:
+            arrays = [
+                pa.array(values, type=field.type)
+                for field, values in zip(schema, zip(*batch))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,28 @@
+"""Helpers for CSV imports: spooling request bodies and reading rows."""
+
+import codecs
+import csv
+import tempfile
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from fastapi import Request
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+async def spool_request_body(request: Request) -> BinaryIO:
+    """Copy the streamed request body into a (disk-backed) temporary file."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def read_csv_rows(stream: BinaryIO) -> Iterator[dict]:
+    """Yield each data row of a UTF-8 CSV with a header row as a dict."""
+    text = codecs.getreader("utf-8-sig")(stream)
+    for row in csv.DictReader(text):
+        yield {key.strip(): value for key, value in row.items() if key is not None}
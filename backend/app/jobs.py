@@ -0,0 +1,145 @@
+"""In-process runner for long operations queued with ``?background=true``.
+
+A request that would otherwise hold a connection open past a proxy timeout (bulk
+marks, upserts, CSV imports, rollup rebuilds) records a row in ``jobs``, hands the
+work to a thread pool and answers ``202 Accepted`` at once; clients poll
+``GET /api/v1/jobs/{id}``. Each job runs in its own session on the primary, and its
+status and progress are committed separately from the work, so pollers on any
+worker see them.
+
+The pool is threads rather than processes: the work is mostly database round trips,
+during which the GIL is released, and the services keep per-process state (the
+employee index, memory caches) that a write made in a child process would leave
+stale. Jobs spread over cores with the uvicorn workers, each running its own pool
+of ``JOB_WORKERS`` threads.
+
+Each runner owns the jobs it queued and refreshes their heartbeat every
+``JOB_HEARTBEAT_SECONDS``, whether or not they report progress. Every runner also
+fails unfinished jobs whose owner has not heartbeated for ``JOB_STALE_SECONDS``,
+so jobs of a worker that died are failed while those of live siblings are not.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job import Job
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+# Reports units done so far; the runner stores it as the job's progress
+Progress = Callable[[int], None]
+Work = Callable[[Session, Progress], Any]
+
+
+class JobRunner:
+    def __init__(self):
+        self.owner: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._heartbeat: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._queued: set[str] = set()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                # Chosen here rather than at import so forked workers differ; the
+                # random part keeps it unique when a pid is reused
+                self.owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.JOB_WORKERS, thread_name_prefix="hrms-job"
+                )
+                self._stopping.clear()
+                self._heartbeat = threading.Thread(
+                    target=self._beat, name="hrms-job-heartbeat", daemon=True
+                )
+                self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while True:
+            try:
+                with SessionLocal() as db:
+                    service = JobService(db)
+                    service.heartbeat(self.owner)
+                    failed = service.fail_orphaned(settings.JOB_STALE_SECONDS)
+                if failed:
+                    logger.warning("Failed %d jobs left behind by a stopped worker", failed)
+            except Exception:
+                logger.exception("Job heartbeat failed")
+            if self._stopping.wait(settings.JOB_HEARTBEAT_SECONDS):
+                return
+
+    def submit(
+        self,
+        kind: str,
+        work: Work,
+        total: int | None = None,
+        cleanup: Callable[[], None] | None = None,
+    ) -> Job:
+        """Record a queued job and schedule ``work(db, progress)``; its return value
+        becomes the job's result. ``cleanup`` runs once the job is done either way.
+        """
+        self.start()
+        with SessionLocal() as db:
+            job = JobService(db).create(kind, self.owner, total)
+        with self._lock:
+            self._queued.add(job.id)
+            self._executor.submit(self._run, job.id, work, cleanup)
+        return job
+
+    def _run(self, job_id: str, work: Work, cleanup: Callable[[], None] | None) -> None:
+        with self._lock:
+            self._queued.discard(job_id)
+
+        def progress(done: int) -> None:
+            with SessionLocal() as status_db:
+                JobService(status_db).report_progress(job_id, done)
+
+        try:
+            with SessionLocal() as db:
+                if not JobService(db).start(job_id):
+                    # Failed by the sweep while it waited in the queue
+                    return
+            with SessionLocal() as db:
+                result = work(db, progress)
+        except Exception as exc:
+            logger.exception("Job %s failed", job_id)
+            with SessionLocal() as db:
+                JobService(db).fail(job_id, f"{type(exc).__name__}: {exc}")
+        else:
+            with SessionLocal() as db:
+                JobService(db).succeed(job_id, result)
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    def shutdown(self) -> None:
+        """Finish running jobs; queued ones are dropped and marked failed."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            heartbeat, self._heartbeat = self._heartbeat, None
+        if executor is None:
+            return
+        # Keep heartbeating while the running jobs finish
+        executor.shutdown(wait=True, cancel_futures=True)
+        self._stopping.set()
+        heartbeat.join()
+        with self._lock:
+            dropped, self._queued = self._queued, set()
+        with SessionLocal() as db:
+            for job_id in dropped:
+                JobService(db).fail(job_id, "Cancelled: the worker shut down before it started")
+
+
+job_runner = JobRunner()
@@ -1,22 +1,52 @@
+from contextlib import asynccontextmanager
 from datetime import date
-from fastapi import FastAPI, Query, Request, status
+
+from fastapi import Depends, FastAPI, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
-from app.database import engine, Base
-from app.routers import employees, attendance
-from app.services.employee_service import EmployeeService
-from app.services.attendance_service import AttendanceService
-from app.database import SessionLocal
+from app import metrics
+from app.database import SessionLocal, get_async_db, init_engines, sync_engines
+from app.jobs import job_runner
+from app.routers import analytics, employees, attendance, jobs
+from app.routers.caching import etag
+from app.services.async_services import AsyncDashboardService
+from app.services.employee_index import employee_index
+from app.services.partition_service import PartitionService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engines are created here rather than at import; the schema is managed by
+    # `alembic upgrade head`. Build the employee index before serving so the first
+    # writes do not pay for it, keep the coming months' attendance partitions
+    # ready when partitioned, and start the background job runner.
+    def prepare():
+        init_engines()
+        if settings.METRICS_ENABLED:
+            for db_engine in sync_engines():
+                metrics.instrument_engine(db_engine)
+        with SessionLocal() as db:
+            employee_index.rebuild(db)
+            if db.get_bind().dialect.name == "postgresql":
+                PartitionService(db).ensure_months()
+        job_runner.start()
+
+    await run_in_threadpool(prepare)
+    yield
+    await run_in_threadpool(job_runner.shutdown)
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="HRMS Lite API",
     description="Human Resource Management System - Lite Edition",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -27,6 +57,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request: Request, exc: ValidationError):
@@ -46,28 +79,28 @@ def health_check():
     return {"status": "healthy"}
 
 
-@app.get("/api/v1/dashboard/stats")
-def get_dashboard_stats(today: date | None = Query(None)):
-    db = SessionLocal()
-    try:
-        employee_service = EmployeeService(db)
-        attendance_service = AttendanceService(db)
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
-        # Use client's date if provided, otherwise fall back to server date
-        target_date = today or date.today()
 
-        total_employees = employee_service.count()
-        present_today = attendance_service.count_by_date_and_status(target_date, "Present")
-        absent_today = attendance_service.count_by_date_and_status(target_date, "Absent")
+def _dashboard_date(today: date | None = Query(None)) -> date:
+    # Use client's date if provided, otherwise fall back to server date
+    return today or date.today()
 
-        return {
-            "total_employees": total_employees,
-            "present_today": present_today,
-            "absent_today": absent_today,
-        }
-    finally:
-        db.close()
+
+@app.get(
+    "/api/v1/dashboard/stats",
+    dependencies=[etag("employees", "attendance", scope=_dashboard_date)],
+)
+async def get_dashboard_stats(
+    target_date: date = Depends(_dashboard_date),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    return await AsyncDashboardService(db).get_stats(target_date)
 
 
 app.include_router(employees.router)
 app.include_router(attendance.router)
+app.include_router(analytics.router)
+app.include_router(jobs.router)
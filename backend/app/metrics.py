@@ -0,0 +1,296 @@
+"""Request and SQL instrumentation, exposed in the Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request per route template and collects the
+SQL statements the request issued (count and time) through the hooks that
+``instrument_engine`` installs on an engine. Time not spent in the database is
+spent in the application (validation, serialization), which is what the
+per-request ``Server-Timing`` header and the ``hrms_http_request_db_seconds``
+histogram make visible.
+
+Within a request, the same statement text executed ``N_PLUS_ONE_THRESHOLD`` times
+is flagged as a likely N+1 and logged once. Statements slower than
+``SLOW_QUERY_MS`` are logged with the service method that issued them.
+
+Metrics are kept per process; with several uvicorn workers each one reports its
+own counters.
+"""
+
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as StatementCounts
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+_SERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "services")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+REGISTRY: list["_Metric"] = []
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    # The name carries the _total suffix, on the samples and on HELP/TYPE alike
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labels, key)} {value}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=REQUEST_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        lines = super().render()
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+request_duration = Histogram(
+    "hrms_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ("method", "route", "status"),
+)
+request_db_seconds = Histogram(
+    "hrms_http_request_db_seconds",
+    "Time a request spent executing SQL statements.",
+    ("method", "route"),
+    buckets=STATEMENT_BUCKETS + (2.5, 5.0),
+)
+request_db_statements = Histogram(
+    "hrms_http_request_db_statements",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+statements_total = Counter(
+    "hrms_db_statements_total", "SQL statements executed.", ("operation",)
+)
+statement_duration = Histogram(
+    "hrms_db_statement_duration_seconds",
+    "Execution time of individual SQL statements.",
+    ("operation",),
+    buckets=STATEMENT_BUCKETS,
+)
+slow_statements_total = Counter(
+    "hrms_db_slow_statements_total",
+    "SQL statements slower than SLOW_QUERY_MS.",
+    ("operation",),
+)
+n_plus_one_total = Counter(
+    "hrms_db_n_plus_one_total",
+    "Requests that repeated one statement at least N_PLUS_ONE_THRESHOLD times.",
+    ("method", "route"),
+)
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+@dataclass
+class RequestStats:
+    scope: dict
+    statements: int = 0
+    db_seconds: float = 0.0
+    repeated: StatementCounts = field(default_factory=StatementCounts)
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _route(scope: dict) -> str:
+    # The route template (e.g. /api/v1/attendance/{employee_id}) keeps label
+    # cardinality bounded; unmatched paths share one label.
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return keyword if keyword in _OPERATIONS else "OTHER"
+
+
+def _service_method() -> str:
+    """Qualified name of the innermost service-layer frame on the current stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_SERVICES_DIR):
+            return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+        frame = frame.f_back
+    return "unknown"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    operation = _operation(statement)
+    statements_total.inc(operation)
+    statement_duration.observe(elapsed, operation)
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        if not executemany:
+            stats.repeated[statement] += 1
+
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_statements_total.inc(operation)
+        logger.warning(
+            "Slow query (%.1f ms) in %s%s: %s",
+            elapsed * 1000,
+            _service_method(),
+            f" during {stats.scope['method']} {_route(stats.scope)}" if stats else "",
+            " ".join(statement.split())[:500],
+        )
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement ``engine`` executes (use ``.sync_engine`` for async)."""
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+def _record(stats: RequestStats, status_code: int, elapsed: float) -> None:
+    method, route = stats.scope["method"], _route(stats.scope)
+    request_duration.observe(elapsed, method, route, str(status_code))
+    request_db_seconds.observe(stats.db_seconds, method, route)
+    request_db_statements.observe(stats.statements, method, route)
+
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if not threshold:
+        return
+    repeated = [(sql, count) for sql, count in stats.repeated.items() if count >= threshold]
+    if repeated:
+        n_plus_one_total.inc(method, route)
+        for sql, count in repeated:
+            logger.warning(
+                "Possible N+1 in %s %s: statement executed %d times: %s",
+                method,
+                route,
+                count,
+                " ".join(sql.split())[:500],
+            )
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL usage per route.
+
+    Timing runs until the last body chunk is sent, so streamed listings and
+    exports include the batches read while streaming. A ``Server-Timing`` header
+    reports the database time and statements issued before the response started.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements", '
+                    f"total;dur={total:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            _record(stats, status_code, time.perf_counter() - started)
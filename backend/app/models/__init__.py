@@ -1,4 +1,7 @@
 from app.models.employee import Employee
 from app.models.attendance import Attendance
+from app.models.rollup import DailyAttendanceRollup
+from app.models.table_version import TableVersion
+from app.models.job import Job
 
-__all__ = ["Employee", "Attendance"]
+__all__ = ["Employee", "Attendance", "DailyAttendanceRollup", "TableVersion", "Job"]
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -9,20 +9,23 @@ from app.database import Base
 class Attendance(Base):
     __tablename__ = "attendance"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     employee_id = Column(
         String(50),
         ForeignKey("employees.employee_id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     status = Column(String(20), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     employee = relationship("Employee", back_populates="attendance_records")
 
+    # uq_employee_date doubles as the (employee_id, date) index for per-employee
+    # history and FK cascades; the others back listing order and date/status filters.
     __table_args__ = (
         UniqueConstraint("employee_id", "date", name="uq_employee_date"),
+        Index("ix_attendance_date_id", "date", "id"),
+        Index("ix_attendance_date_status", "date", "status"),
         CheckConstraint("status IN ('Present', 'Absent')", name="check_status"),
     )
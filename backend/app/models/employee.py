@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -9,7 +9,7 @@ from app.database import Base
 class Employee(Base):
     __tablename__ = "employees"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     employee_id = Column(String(50), unique=True, nullable=False, index=True)
     full_name = Column(String(100), nullable=False)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -17,6 +17,19 @@ class Employee(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Deleting an employee leaves the attendance rows to the FK's ON DELETE CASCADE
+    # instead of loading and deleting them one by one through the ORM
     attendance_records = relationship(
-        "Attendance", back_populates="employee", cascade="all, delete-orphan"
+        "Attendance",
+        back_populates="employee",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # The directory lists newest first by (created_at, id), optionally within a
+    # department, and filters by employee_id / full_name prefix.
+    __table_args__ = (
+        Index("ix_employees_created_at_id", "created_at", "id"),
+        Index("ix_employees_department_created_at_id", "department", "created_at", "id"),
+        Index("ix_employees_full_name", "full_name"),
     )
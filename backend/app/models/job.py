@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+
+from app.database import Base
+
+
+class Job(Base):
+    """A long-running operation queued by the API and run by ``app.jobs``.
+
+    ``status`` goes queued -> running -> succeeded | failed. ``owner`` is the runner
+    (one per worker process) that queued the job; it refreshes ``heartbeat_at`` on
+    all of its unfinished jobs, so a job whose worker died can be told apart from a
+    slow one.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    progress = Column(Integer, nullable=False, default=0)
+    # Units of work when known up front (rows, employees); progress counts toward it
+    total = Column(Integer)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    owner = Column(String(64), nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # The sweep looks for unfinished jobs whose owner stopped heartbeating
+    __table_args__ = (Index("ix_jobs_status_heartbeat_at", "status", "heartbeat_at"),)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Date
+
+from app.database import Base
+
+
+class DailyAttendanceRollup(Base):
+    """Present/absent counts per day and department, kept in step with ``attendance``."""
+
+    __tablename__ = "daily_attendance_rollup"
+
+    date = Column(Date, primary_key=True)
+    department = Column(String(100), primary_key=True)
+    present_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,157 @@
+"""EXPLAIN the statements issued by the service layer and flag full table scans.
+
+Every hot read in ``AttendanceService``, ``RollupService`` and ``EmployeeService``
+is executed once against the configured database while its SQL is captured; each
+captured statement is then EXPLAINed with the same parameters. On PostgreSQL
+sequential scans are disabled for the check so the result reflects whether an
+index *can* serve the query, not what the planner picks for a near-empty table.
+"""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.analytics_service import AnalyticsService
+from app.services.attendance_service import AttendanceService
+from app.services.attendance_stats_service import AttendanceStatsService
+from app.services.employee_service import EmployeeService
+from app.services.rollup_service import RollupService
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    statement: str
+    plan: list[str]
+    full_scans: list[str]
+
+    @property
+    def uses_index(self) -> bool:
+        return not self.full_scans
+
+
+def _service_calls(db: Session) -> list[tuple[str, Callable]]:
+    attendance = AttendanceService(db)
+    employees = EmployeeService(db)
+    rollup = RollupService(db)
+    stats = AttendanceStatsService(db)
+    analytics = AnalyticsService(db)
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+
+    return [
+        ("attendance.get_all", lambda: attendance.get_all(limit=50)),
+        ("attendance.get_all:keyset", lambda: attendance.get_all(after=(today, 1), limit=50)),
+        (
+            "attendance.get_all:date_range",
+            lambda: attendance.get_all(date_from=month_ago, date_to=today, limit=50),
+        ),
+        (
+            "attendance.get_all:status",
+            lambda: attendance.get_all(date_from=today, date_to=today, status="Present"),
+        ),
+        ("attendance.get_all:employees", lambda: attendance.get_all(employee_ids=["E1", "E2"])),
+        (
+            "attendance.get_summary:employees",
+            lambda: attendance.get_summary(employee_ids=["E1"], date_from=month_ago),
+        ),
+        (
+            "attendance.iter_export_batches",
+            lambda: list(attendance.iter_export_batches(date_from=month_ago, date_to=today)),
+        ),
+        ("attendance.get_by_id", lambda: attendance.get_by_id(1)),
+        ("attendance.get_by_employee_id", lambda: attendance.get_by_employee_id("E1")),
+        (
+            "attendance.get_by_employee_and_date",
+            lambda: attendance.get_by_employee_and_date("E1", today),
+        ),
+        ("attendance_stats.get_history", lambda: stats.get_history("E1")),
+        (
+            "analytics.department_rates",
+            lambda: analytics.department_rates(month_ago, today),
+        ),
+        (
+            "analytics.department_heatmap",
+            lambda: analytics.department_heatmap(month_ago, today),
+        ),
+        ("rollup.get_totals", lambda: rollup.get_totals(month_ago, today)),
+        ("employees.get_all", lambda: employees.get_all(limit=50)),
+        (
+            "employees.get_all:department",
+            lambda: employees.get_all(department="Engineering", limit=50),
+        ),
+        ("employees.get_all:search", lambda: employees.get_all(search="EMP", limit=50)),
+        (
+            "employees.get_projection",
+            lambda: employees.get_projection(["employee_id", "full_name"], limit=50),
+        ),
+        ("employees.get_by_employee_id", lambda: employees.get_by_employee_id("E1")),
+        ("employees.get_by_email", lambda: employees.get_by_email("e1@example.com")),
+    ]
+
+
+def _explain_sqlite(connection, statement, parameters) -> tuple[list[str], list[str]]:
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    plan = [row[-1] for row in rows]
+    # "SCAN t" is a full table scan; "SCAN t USING [COVERING] INDEX ix" walks an index
+    full_scans = [line for line in plan if line.startswith("SCAN") and "USING" not in line]
+    return plan, full_scans
+
+
+def _explain_postgresql(connection, statement, parameters) -> tuple[list[str], list[str]]:
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    raw = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    ).scalar()
+    root = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+    plan, full_scans = [], []
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        line = "  " * depth + node["Node Type"]
+        if "Relation Name" in node:
+            line += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            line += f" using {node['Index Name']}"
+        plan.append(line)
+        if node["Node Type"] == "Seq Scan":
+            full_scans.append(line.strip())
+        stack.extend((child, depth + 1) for child in reversed(node.get("Plans", [])))
+    return plan, full_scans
+
+
+_EXPLAINERS = {"sqlite": _explain_sqlite, "postgresql": _explain_postgresql}
+
+
+def check_query_plans(db: Session) -> list[QueryPlan]:
+    bind = db.get_bind()
+    explain = _EXPLAINERS.get(bind.dialect.name)
+    if explain is None:
+        raise NotImplementedError(f"Query plan checks are not supported on {bind.dialect.name}")
+
+    results = []
+    for name, call in _service_calls(db):
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        event.listen(bind, "before_cursor_execute", capture)
+        try:
+            call()
+        finally:
+            event.remove(bind, "before_cursor_execute", capture)
+            db.rollback()
+
+        connection = db.connection()
+        for statement, parameters in captured:
+            plan, full_scans = explain(connection, statement, parameters)
+            results.append(QueryPlan(name, statement, plan, full_scans))
+        db.rollback()
+
+    return results
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_async_db
+from app.routers.caching import etag
+from app.schemas.analytics import DepartmentHeatmap, DepartmentRates
+from app.services.async_services import AsyncAnalyticsService
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366 * 5
+
+
+def _date_range(
+    date_from: date | None = Query(None), date_to: date | None = Query(None)
+) -> tuple[date, date]:
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to",
+        )
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days",
+        )
+    return date_from, date_to
+
+
+@router.get(
+    "/departments",
+    response_model=DepartmentRates,
+    dependencies=[etag("attendance", "employees", scope=_date_range)],
+)
+async def get_department_rates(
+    dates: tuple[date, date] = Depends(_date_range),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    """Present/absent totals and attendance rate per department (last 30 days by default)."""
+    return await AsyncAnalyticsService(db).department_rates(*dates)
+
+
+@router.get(
+    "/departments/heatmap",
+    response_model=DepartmentHeatmap,
+    dependencies=[etag("attendance", "employees", scope=_date_range)],
+)
+async def get_department_heatmap(
+    dates: tuple[date, date] = Depends(_date_range),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    """Department x day matrices of present/absent counts and attendance rate."""
+    return await AsyncAnalyticsService(db).department_heatmap(*dates)
@@ -1,136 +1,340 @@
+import csv
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
+from app.database import get_async_db, get_db, integrity_violation
+from app.exports import encode_csv, encode_parquet, parquet_available
+from app.imports import read_csv_rows, spool_request_body
+from app.jobs import job_runner
+from app.routers.caching import etag
+from app.routers.jobs import ACCEPTED_RESPONSE, BACKGROUND, accepted, queue_import
+from app.routers.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
 from app.schemas.attendance import (
+    AttendanceBatchResult,
+    AttendanceBatchUpdate,
     AttendanceCreate,
     AttendanceUpdate,
     AttendanceResponse,
     AttendanceList,
+    AttendanceUpsert,
     BulkAttendanceCreate,
     BulkAttendanceResult,
+    EmployeeAttendanceStats,
 )
-from app.services.attendance_service import AttendanceService
+from app.schemas.imports import ImportResult
+from app.services.async_services import AsyncAttendanceService, AsyncAttendanceStatsService
+from app.services.attendance_service import EXPORT_COLUMNS, AttendanceService
+from app.services.import_service import ImportService
 
 router = APIRouter(prefix="/api/v1/attendance", tags=["attendance"])
 
+STREAM_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 5000
 
-def _to_response(attendance) -> AttendanceResponse:
-    return AttendanceResponse(
-        id=attendance.id,
-        employee_id=attendance.employee_id,
-        date=attendance.date,
-        status=attendance.status,
-        created_at=attendance.created_at,
-        employee_name=attendance.employee.full_name if attendance.employee else None,
+
+def _to_row(attendance) -> dict:
+    """An ``AttendanceResponse``-shaped dict for a loaded ``Attendance`` row."""
+    return {
+        "id": attendance.id,
+        "employee_id": attendance.employee_id,
+        "date": attendance.date,
+        "status": attendance.status,
+        "created_at": attendance.created_at,
+        "employee_name": attendance.employee.full_name if attendance.employee else None,
+    }
+
+
+def _json_response(content: dict, response: Response, status_code: int = 200) -> Response:
+    """Serialize rows read from the database straight to JSON with orjson.
+
+    The rows already satisfy the route's ``response_model``, so re-validating them
+    through pydantic only costs CPU on large listings. Headers set by dependencies
+    (the ETag) are carried over since a returned Response replaces FastAPI's own.
+    """
+    return Response(
+        orjson.dumps(content),
+        status_code=status_code,
+        headers=response.headers,
+        media_type="application/json",
     )
 
 
-@router.get("", response_model=AttendanceList)
-def list_attendance(
+async def _stream_ndjson(batches):
+    async for batch in batches:
+        yield b"".join(orjson.dumps(_to_row(record)) + b"\n" for record in batch)
+
+
+@router.get(
+    "",
+    response_model=AttendanceList,
+    dependencies=[etag("attendance", "employees")],
+)
+async def list_attendance(
+    response: Response,
     employee_ids: list[str] | None = Query(None),
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
     status: str | None = Query(None),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: Literal["json", "ndjson"] = Query("json"),
+    db: AsyncSession | Session = Depends(get_async_db),
 ):
-    service = AttendanceService(db)
-    records = service.get_all(
+    service = AsyncAttendanceService(db)
+
+    if format == "ndjson":
+        # One JSON object per line, read from the database in batches
+        batches = service.iter_batches(
+            batch_size=STREAM_BATCH_SIZE,
+            employee_ids=employee_ids,
+            date_from=date_from,
+            date_to=date_to,
+            status=status,
+        )
+        return StreamingResponse(
+            _stream_ndjson(batches), headers=response.headers, media_type="application/x-ndjson"
+        )
+
+    records = await service.get_all(
         employee_ids=employee_ids,
         date_from=date_from,
         date_to=date_to,
         status=status,
+        after=decode_cursor(cursor, date.fromisoformat) if cursor else None,
+        limit=limit,
     )
     # Get summary without status filter to show total counts
-    summary = service.get_summary(
+    summary = await service.get_summary(
         employee_ids=employee_ids,
         date_from=date_from,
         date_to=date_to,
     )
-    return AttendanceList(
-        attendance=[_to_response(r) for r in records],
-        total=len(records),
-        present_count=summary["present"],
-        absent_count=summary["absent"],
+    return _json_response(
+        {
+            "attendance": [_to_row(r) for r in records],
+            "total": len(records),
+            "present_count": summary["present"],
+            "absent_count": summary["absent"],
+            "next_cursor": (
+                encode_cursor(records[-1].date, records[-1].id)
+                if limit and len(records) == limit
+                else None
+            ),
+        },
+        response,
     )
 
 
-@router.get("/{employee_id}", response_model=AttendanceList)
-def get_employee_attendance(employee_id: str, db: Session = Depends(get_db)):
-    service = AttendanceService(db)
+@router.get("/export", dependencies=[etag("attendance", "employees")])
+async def export_attendance(
+    response: Response,
+    employee_ids: list[str] | None = Query(None),
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    status: str | None = Query(None),
+    format: Literal["csv", "parquet"] = Query("csv"),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export requires the optional 'pyarrow' package",
+        )
+
+    batches = AsyncAttendanceService(db).iter_export_batches(
+        batch_size=EXPORT_BATCH_SIZE,
+        employee_ids=employee_ids,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+    )
+    if format == "parquet":
+        body = encode_parquet(EXPORT_COLUMNS, batches)
+        media_type = "application/vnd.apache.parquet"
+    else:
+        body = encode_csv(EXPORT_COLUMNS, batches)
+        media_type = "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            **response.headers,
+            "Content-Disposition": f'attachment; filename="attendance.{format}"',
+        },
+    )
+
+
+@router.get(
+    "/{employee_id}/stats",
+    response_model=EmployeeAttendanceStats,
+    dependencies=[etag("attendance", "employees")],
+)
+async def get_employee_attendance_stats(
+    employee_id: str,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    """Monthly present/absent counts, attendance rate and Present streaks.
+
+    Streaks count consecutive marked days; unmarked days (weekends, holidays)
+    do not break them.
+    """
+    stats = await AsyncAttendanceStatsService(db).get_stats(employee_id, date_from, date_to)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employee with ID '{employee_id}' not found",
+        )
+    return stats
+
+
+@router.get(
+    "/{employee_id}",
+    response_model=AttendanceList,
+    dependencies=[etag("attendance", "employees")],
+)
+async def get_employee_attendance(
+    employee_id: str,
+    response: Response,
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    service = AsyncAttendanceService(db)
 
-    if not service.employee_exists(employee_id):
+    if not await service.employee_exists(employee_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found",
         )
 
-    records = service.get_by_employee_id(employee_id)
-    return AttendanceList(
-        attendance=[_to_response(r) for r in records], total=len(records)
+    records = await service.get_by_employee_id(employee_id)
+    return _json_response(
+        {
+            "attendance": [_to_row(r) for r in records],
+            "total": len(records),
+            "present_count": 0,
+            "absent_count": 0,
+            "next_cursor": None,
+        },
+        response,
     )
 
 
 @router.post("", response_model=AttendanceResponse, status_code=status.HTTP_201_CREATED)
 def mark_attendance(attendance_data: AttendanceCreate, db: Session = Depends(get_db)):
     service = AttendanceService(db)
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Employee with ID '{attendance_data.employee_id}' not found",
+    )
 
+    # An in-memory index lookup; duplicates are left to uq_employee_date
     if not service.employee_exists(attendance_data.employee_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Employee with ID '{attendance_data.employee_id}' not found",
-        )
+        raise not_found
 
-    existing = service.get_by_employee_and_date(
-        attendance_data.employee_id, attendance_data.date
-    )
-    if existing:
+    try:
+        attendance = service.create(attendance_data)
+    except IntegrityError as exc:
+        kind, _ = integrity_violation(exc)
+        if kind == "foreign_key":
+            # Deleted by a concurrent request after the existence check
+            raise not_found
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Attendance for employee '{attendance_data.employee_id}' on {attendance_data.date} already exists",
+            detail=f"Attendance for employee '{attendance_data.employee_id}' "
+            f"on {attendance_data.date} already exists",
         )
+    return _to_row(attendance)
 
+
+@router.post(
+    "/bulk",
+    response_model=BulkAttendanceResult,
+    status_code=status.HTTP_201_CREATED,
+    responses=ACCEPTED_RESPONSE,
+)
+def mark_bulk_attendance(
+    data: BulkAttendanceCreate,
+    response: Response,
+    background: bool = BACKGROUND,
+    db: Session = Depends(get_db),
+):
+    if background:
+
+        def work(job_db, progress):
+            created, skipped = AttendanceService(job_db).create_bulk(data)
+            return {"created": created, "skipped": skipped}
+
+        job = job_runner.submit("attendance.bulk", work, total=len(data.employee_ids))
+        return accepted(job, response)
+
+    service = AttendanceService(db)
     try:
-        attendance = service.create(attendance_data)
-        return _to_response(attendance)
+        created, skipped = service.create_bulk(data)
     except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="Attendance record already exists for this employee and date",
+            detail="Attendance could not be marked, please retry",
         )
+    return _json_response(
+        {"created": created, "skipped": skipped},
+        response,
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.post("/bulk", response_model=BulkAttendanceResult, status_code=status.HTTP_201_CREATED)
-def mark_bulk_attendance(data: BulkAttendanceCreate, db: Session = Depends(get_db)):
-    service = AttendanceService(db)
-    created = []
-    skipped = []
+def _batch_content(results: list[dict]) -> dict:
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "not_found": 0}
+    for result in results:
+        counts[result["outcome"]] += 1
+    return {"results": results, **counts}
 
-    for employee_id in data.employee_ids:
-        if not service.employee_exists(employee_id):
-            skipped.append({"employee_id": employee_id, "reason": "Employee not found"})
-            continue
 
-        existing = service.get_by_employee_and_date(employee_id, data.date)
-        if existing:
-            skipped.append({"employee_id": employee_id, "reason": "Attendance already marked"})
-            continue
+def _batch_result(results: list[dict], response: Response) -> Response:
+    return _json_response(_batch_content(results), response)
 
-        try:
-            attendance_data = AttendanceCreate(
-                employee_id=employee_id,
-                date=data.date,
-                status=data.status,
-            )
-            attendance = service.create(attendance_data)
-            created.append(_to_response(attendance))
-        except IntegrityError:
-            skipped.append({"employee_id": employee_id, "reason": "Database error"})
 
-    return BulkAttendanceResult(created=created, skipped=skipped)
+@router.patch("", response_model=AttendanceBatchResult)
+def update_attendance_batch(
+    data: AttendanceBatchUpdate, response: Response, db: Session = Depends(get_db)
+):
+    """Set the status of many existing records, by id or employee_id and date."""
+    return _batch_result(AttendanceService(db).update_many(data.items), response)
+
+
+@router.post("/upsert", response_model=AttendanceBatchResult, responses=ACCEPTED_RESPONSE)
+def upsert_attendance(
+    data: AttendanceUpsert,
+    response: Response,
+    background: bool = BACKGROUND,
+    db: Session = Depends(get_db),
+):
+    """Mark many (employee_id, date) pairs, overwriting the status of existing records."""
+    if background:
+
+        def work(job_db, progress):
+            return _batch_content(AttendanceService(job_db).upsert_many(data.items))
+
+        job = job_runner.submit("attendance.upsert", work, total=len(data.items))
+        return accepted(job, response)
+
+    try:
+        results = AttendanceService(db).upsert_many(data.items)
+    except IntegrityError:
+        # An employee was deleted while the batch was written
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Attendance could not be marked, please retry",
+        )
+    return _batch_result(results, response)
 
 
 @router.put("/{id}", response_model=AttendanceResponse)
@@ -144,4 +348,28 @@ def update_attendance(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Attendance record with ID {id} not found",
         )
-    return _to_response(attendance)
+    return _to_row(attendance)
+
+
+@router.post("/import", response_model=ImportResult, responses=ACCEPTED_RESPONSE)
+async def import_attendance(
+    request: Request,
+    response: Response,
+    background: bool = BACKGROUND,
+    db: Session = Depends(get_db),
+):
+    """Import a CSV request body with the header row: employee_id, date, status."""
+    upload = await spool_request_body(request)
+    if background:
+        return await queue_import("attendance", upload, response)
+    try:
+        return await run_in_threadpool(
+            lambda: ImportService(db).import_attendance(read_csv_rows(upload))
+        )
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read CSV: {exc}",
+        )
+    finally:
+        upload.close()
@@ -0,0 +1,55 @@
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import get_async_db
+from app.services.async_services import AsyncVersionService
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _no_scope() -> None:
+    return None
+
+
+def etag(*tables: str, scope: Callable[..., Any] | None = None):
+    """Dependency that tags a GET response with the write versions of ``tables``.
+
+    A request whose If-None-Match matches the current tag is answered with 304
+    before the endpoint runs, so no ORM query or pydantic model is built.
+
+    ``scope`` is a dependency for inputs that change the body without any write,
+    such as a date that defaults to today; its value (a date, or a tuple of them)
+    is part of the tag. The endpoint should depend on the same callable so both
+    see the value resolved once for the request.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession | Session = Depends(get_async_db),
+        scoped: Any = Depends(scope or _no_scope),
+    ) -> None:
+        versions = await AsyncVersionService(db).get(tables)
+        parts = [f"{t}.{v}" for t, v in zip(tables, versions)]
+        if scoped is not None:
+            values = scoped if isinstance(scoped, tuple) else (scoped,)
+            parts.extend(str(value) for value in values)
+        tag = 'W/"' + "-".join(parts) + '"'
+        headers = {"ETag": tag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, tag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(dependency)
@@ -1,25 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.schemas.employee import EmployeeCreate, EmployeeResponse, EmployeeList
-from app.services.employee_service import EmployeeService
+from app.database import get_async_db, get_db, integrity_violation
+from app.imports import read_csv_rows, spool_request_body
+from app.routers.caching import etag
+from app.routers.jobs import ACCEPTED_RESPONSE, BACKGROUND, queue_import
+from app.routers.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.schemas.employee import (
+    EmployeeBatchDelete,
+    EmployeeBatchDeleteResult,
+    EmployeeCreate,
+    EmployeeResponse,
+    EmployeeList,
+    EmployeeFieldsList,
+)
+from app.schemas.imports import ImportResult
+from app.services.async_services import AsyncEmployeeService
+from app.services.employee_service import DIRECTORY_FIELDS, EmployeeService
+from app.services.import_service import ImportService
 
 router = APIRouter(prefix="/api/v1/employees", tags=["employees"])
 
 
-@router.get("", response_model=EmployeeList)
-def list_employees(db: Session = Depends(get_db)):
-    service = EmployeeService(db)
-    employees = service.get_all()
-    return EmployeeList(employees=employees, total=len(employees))
+def _parse_fields(fields: str) -> list[str]:
+    selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in DIRECTORY_FIELDS]
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {unknown}; choose from {list(DIRECTORY_FIELDS)}",
+        )
+    return selected
 
 
-@router.get("/{employee_id}", response_model=EmployeeResponse)
-def get_employee(employee_id: str, db: Session = Depends(get_db)):
-    service = EmployeeService(db)
-    employee = service.get_by_employee_id(employee_id)
+@router.get(
+    "",
+    response_model=EmployeeList | EmployeeFieldsList,
+    dependencies=[etag("employees")],
+)
+async def list_employees(
+    department: str | None = Query(None),
+    search: str | None = Query(None, min_length=1),
+    cursor: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = Query(None),
+    db: AsyncSession | Session = Depends(get_async_db),
+):
+    service = AsyncEmployeeService(db)
+    filters = {
+        "department": department,
+        "search": search,
+        "after": decode_cursor(cursor, datetime.fromisoformat) if cursor else None,
+        "limit": limit,
+    }
+
+    if fields:
+        selected = _parse_fields(fields)
+        rows = await service.get_projection(selected, **filters)
+        keys = [(row["created_at"], row["id"]) for row in rows[-1:]]
+        employees = [{name: row[name] for name in selected} for row in rows]
+        list_model = EmployeeFieldsList
+    else:
+        employees = await service.get_all(**filters)
+        keys = [(e.created_at, e.id) for e in employees[-1:]]
+        list_model = EmployeeList
+
+    next_cursor = None
+    if limit and len(employees) == limit:
+        next_cursor = encode_cursor(*keys[0])
+    return list_model(employees=employees, total=len(employees), next_cursor=next_cursor)
+
+
+@router.get(
+    "/{employee_id}",
+    response_model=EmployeeResponse,
+    dependencies=[etag("employees")],
+)
+async def get_employee(employee_id: str, db: AsyncSession | Session = Depends(get_async_db)):
+    service = AsyncEmployeeService(db)
+    employee = await service.get_by_employee_id(employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -30,30 +95,17 @@ def get_employee(employee_id: str, db: Session = Depends(get_db)):
 
 @router.post("", response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
 def create_employee(employee_data: EmployeeCreate, db: Session = Depends(get_db)):
-    service = EmployeeService(db)
-
-    existing_by_id = service.get_by_employee_id(employee_data.employee_id)
-    if existing_by_id:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Employee with ID '{employee_data.employee_id}' already exists",
-        )
-
-    existing_by_email = service.get_by_email(employee_data.email)
-    if existing_by_email:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Employee with email '{employee_data.email}' already exists",
-        )
-
+    # The unique indexes decide duplicates in the INSERT itself, so two concurrent
+    # requests for the same ID or email cannot both pass a pre-check
     try:
-        employee = service.create(employee_data)
-        return employee
-    except IntegrityError:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Employee with this ID or email already exists",
-        )
+        return EmployeeService(db).create(employee_data)
+    except IntegrityError as exc:
+        _, target = integrity_violation(exc)
+        if target.endswith("email"):
+            detail = f"Employee with email '{employee_data.email}' already exists"
+        else:
+            detail = f"Employee with ID '{employee_data.employee_id}' already exists"
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
 
 
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -65,3 +117,36 @@ def delete_employee(employee_id: str, db: Session = Depends(get_db)):
             detail=f"Employee with ID '{employee_id}' not found",
         )
     return None
+
+
+@router.post("/bulk-delete", response_model=EmployeeBatchDeleteResult)
+def delete_employees(data: EmployeeBatchDelete, db: Session = Depends(get_db)):
+    """Delete several employees (and their attendance) in one transaction."""
+    deleted = EmployeeService(db).delete_many(data.employee_ids)
+    removed = set(deleted)
+    not_found = [i for i in dict.fromkeys(data.employee_ids) if i not in removed]
+    return {"deleted": deleted, "not_found": not_found}
+
+
+@router.post("/import", response_model=ImportResult, responses=ACCEPTED_RESPONSE)
+async def import_employees(
+    request: Request,
+    response: Response,
+    background: bool = BACKGROUND,
+    db: Session = Depends(get_db),
+):
+    """Import a CSV request body with the header row: employee_id, full_name, email, department."""
+    upload = await spool_request_body(request)
+    if background:
+        return await queue_import("employees", upload, response)
+    try:
+        return await run_in_threadpool(
+            lambda: ImportService(db).import_employees(read_csv_rows(upload))
+        )
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read CSV: {exc}",
+        )
+    finally:
+        upload.close()
@@ -0,0 +1,87 @@
+from datetime import date
+from typing import BinaryIO
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import get_async_db, stick_to_primary
+from app.imports import read_csv_rows
+from app.jobs import job_runner
+from app.models.job import Job
+from app.schemas.job import JobResponse
+from app.services.async_services import AsyncJobService
+from app.services.import_service import ImportService
+from app.services.rollup_service import RollupService
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+# Query parameter and OpenAPI entry for endpoints that can run as a background job
+BACKGROUND = Query(False, description="Queue as a background job and answer 202 with its id")
+ACCEPTED_RESPONSE = {
+    status.HTTP_202_ACCEPTED: {
+        "model": JobResponse,
+        "description": "Queued as a background job (background=true); poll the Location URL",
+    }
+}
+
+
+def accepted(job: Job, response: Response) -> JSONResponse:
+    """202 with the queued job, keeping headers set by dependencies.
+
+    The client is pinned to the primary so its first polls do not miss the job on
+    a lagging replica.
+    """
+    stick_to_primary(response)
+    return JSONResponse(
+        jsonable_encoder(JobResponse.model_validate(job)),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={**response.headers, "Location": f"{router.prefix}/{job.id}"},
+    )
+
+
+async def queue_import(kind: str, upload: BinaryIO, response: Response) -> JSONResponse:
+    """Run a spooled CSV import of ``kind`` ("employees" or "attendance") as a job."""
+
+    def work(db, progress):
+        service = ImportService(db, on_batch=lambda report: progress(report["processed"]))
+        return getattr(service, f"import_{kind}")(read_csv_rows(upload))
+
+    job = await run_in_threadpool(
+        job_runner.submit, f"{kind}.import", work, cleanup=upload.close
+    )
+    return accepted(job, response)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db: AsyncSession | Session = Depends(get_async_db)):
+    """Status, progress and, once finished, the result or error of a background job."""
+    job = await AsyncJobService(db).get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+    return job
+
+
+@router.post(
+    "/rollup-rebuild",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rebuild_rollup(
+    response: Response,
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+):
+    """Queue a rebuild of the daily attendance rollup (``app.cli rebuild-rollup``)."""
+
+    def work(db, progress):
+        return {"rows": RollupService(db).rebuild(date_from, date_to)}
+
+    job = await run_in_threadpool(job_runner.submit, "rollup.rebuild", work)
+    return accepted(job, response)
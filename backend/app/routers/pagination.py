@@ -0,0 +1,26 @@
+import base64
+import binascii
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import HTTPException, status
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(sort_key: Any, id: int) -> str:
+    """Opaque keyset cursor for the last row of a page ordered by (sort_key, id)."""
+    raw = f"{sort_key.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, parse_sort_key: Callable[[str], Any]) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_part, id_part = raw.rsplit("|", 1)
+        return parse_sort_key(sort_part), int(id_part)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
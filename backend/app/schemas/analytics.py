@@ -0,0 +1,28 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class DepartmentRate(BaseModel):
+    department: str
+    present: int
+    absent: int
+    attendance_rate: float | None = None
+
+
+class DepartmentRates(BaseModel):
+    date_from: date
+    date_to: date
+    departments: list[DepartmentRate]
+
+
+class DepartmentHeatmap(BaseModel):
+    """Department x day matrices: ``present[i][j]`` is departments[i] on dates[j]."""
+
+    date_from: date
+    date_to: date
+    departments: list[str]
+    dates: list[date]
+    present: list[list[int]]
+    absent: list[list[int]]
+    attendance_rate: list[list[float | None]]
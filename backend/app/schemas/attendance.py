@@ -1,7 +1,9 @@
-from datetime import date, datetime
+import datetime as dt
+import time
+from datetime import date, datetime, timedelta
 from enum import Enum
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 
 
 class AttendanceStatus(str, Enum):
@@ -9,6 +11,27 @@ class AttendanceStatus(str, Enum):
     ABSENT = "Absent"
 
 
+_latest_allowed = (0.0, date.min)
+
+
+def _latest_allowed_date() -> date:
+    # Allow 1 day buffer for timezone differences (client may be ahead of UTC server).
+    # The bound is recomputed at most once a minute instead of on every validation.
+    global _latest_allowed
+    expires_at, latest = _latest_allowed
+    now = time.monotonic()
+    if now >= expires_at:
+        latest = date.today() + timedelta(days=1)
+        _latest_allowed = (now + 60, latest)
+    return latest
+
+
+def _validate_not_future(v: date) -> date:
+    if v > _latest_allowed_date():
+        raise ValueError("Attendance date cannot be in the future")
+    return v
+
+
 class AttendanceBase(BaseModel):
     employee_id: str
     date: date
@@ -17,11 +40,7 @@ class AttendanceBase(BaseModel):
     @field_validator("date")
     @classmethod
     def validate_date(cls, v: date) -> date:
-        # Allow 1 day buffer for timezone differences (client may be ahead of UTC server)
-        from datetime import timedelta
-        if v > date.today() + timedelta(days=1):
-            raise ValueError("Attendance date cannot be in the future")
-        return v
+        return _validate_not_future(v)
 
 
 class AttendanceCreate(AttendanceBase):
@@ -36,11 +55,7 @@ class BulkAttendanceCreate(BaseModel):
     @field_validator("date")
     @classmethod
     def validate_date(cls, v: date) -> date:
-        # Allow 1 day buffer for timezone differences (client may be ahead of UTC server)
-        from datetime import timedelta
-        if v > date.today() + timedelta(days=1):
-            raise ValueError("Attendance date cannot be in the future")
-        return v
+        return _validate_not_future(v)
 
     @field_validator("employee_ids")
     @classmethod
@@ -54,6 +69,62 @@ class AttendanceUpdate(BaseModel):
     status: AttendanceStatus
 
 
+class AttendanceBatchItem(BaseModel):
+    """A record to update, identified by ``id`` or by ``employee_id`` and ``date``."""
+
+    id: int | None = None
+    employee_id: str | None = None
+    date: dt.date | None = None
+    status: AttendanceStatus
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        by_pair = (self.employee_id is not None, self.date is not None)
+        if by_pair != ((self.id is None,) * 2):
+            raise ValueError("Give either id or both employee_id and date")
+        return self
+
+
+def _validate_items(v: list) -> list:
+    if not v:
+        raise ValueError("At least one item is required")
+    return v
+
+
+class AttendanceBatchUpdate(BaseModel):
+    items: list[AttendanceBatchItem]
+
+    @field_validator("items")
+    @classmethod
+    def validate_items(cls, v: list[AttendanceBatchItem]) -> list[AttendanceBatchItem]:
+        return _validate_items(v)
+
+
+class AttendanceUpsert(BaseModel):
+    items: list[AttendanceCreate]
+
+    @field_validator("items")
+    @classmethod
+    def validate_items(cls, v: list[AttendanceCreate]) -> list[AttendanceCreate]:
+        return _validate_items(v)
+
+
+class AttendanceBatchOutcome(BaseModel):
+    id: int | None = None
+    employee_id: str | None = None
+    date: dt.date | None = None
+    status: AttendanceStatus
+    outcome: str  # created, updated, unchanged or not_found
+
+
+class AttendanceBatchResult(BaseModel):
+    results: list[AttendanceBatchOutcome]
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    not_found: int = 0
+
+
 class AttendanceResponse(BaseModel):
     id: int
     employee_id: str
@@ -71,8 +142,28 @@ class AttendanceList(BaseModel):
     total: int
     present_count: int = 0
     absent_count: int = 0
+    next_cursor: str | None = None
 
 
 class BulkAttendanceResult(BaseModel):
     created: list[AttendanceResponse]
     skipped: list[dict]
+
+
+class MonthlyAttendance(BaseModel):
+    month: str  # YYYY-MM
+    present: int
+    absent: int
+    attendance_rate: float | None = None
+
+
+class EmployeeAttendanceStats(BaseModel):
+    employee_id: str
+    date_from: date | None = None
+    date_to: date | None = None
+    present: int
+    absent: int
+    attendance_rate: float | None = None
+    current_streak: int
+    longest_streak: int
+    months: list[MonthlyAttendance]
@@ -1,5 +1,6 @@
 import re
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, EmailStr, field_validator
 
@@ -40,6 +41,22 @@ class EmployeeCreate(EmployeeBase):
     pass
 
 
+class EmployeeBatchDelete(BaseModel):
+    employee_ids: list[str]
+
+    @field_validator("employee_ids")
+    @classmethod
+    def validate_employee_ids(cls, v: list[str]) -> list[str]:
+        if not v:
+            raise ValueError("At least one employee must be selected")
+        return v
+
+
+class EmployeeBatchDeleteResult(BaseModel):
+    deleted: list[str]
+    not_found: list[str]
+
+
 class EmployeeResponse(EmployeeBase):
     id: int
     created_at: datetime
@@ -52,3 +69,12 @@ class EmployeeResponse(EmployeeBase):
 class EmployeeList(BaseModel):
     employees: list[EmployeeResponse]
     total: int
+    next_cursor: str | None = None
+
+
+class EmployeeFieldsList(BaseModel):
+    """Directory page restricted to the columns requested with ``fields=``."""
+
+    employees: list[dict[str, Any]]
+    total: int
+    next_cursor: str | None = None
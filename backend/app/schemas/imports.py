@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    processed: int
+    created: int
+    failed: int
+    errors: list[ImportRowError]
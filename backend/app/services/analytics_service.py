@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.rollup import DailyAttendanceRollup
+from app.services.attendance_stats_service import attendance_rate
+
+
+class AnalyticsService:
+    """Department-level attendance aggregates.
+
+    Both reads are one grouped range scan over ``daily_attendance_rollup``, which
+    already holds the attendance x employees join grouped by day and department,
+    so their cost depends on days x departments rather than on headcount.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def department_rates(self, date_from: date, date_to: date) -> dict:
+        rollup = DailyAttendanceRollup
+        rows = self.db.execute(
+            select(
+                rollup.department,
+                func.sum(rollup.present_count),
+                func.sum(rollup.absent_count),
+            )
+            .where(rollup.date >= date_from, rollup.date <= date_to)
+            .group_by(rollup.department)
+            .order_by(rollup.department)
+        ).all()
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "departments": [
+                {
+                    "department": department,
+                    "present": present,
+                    "absent": absent,
+                    "attendance_rate": attendance_rate(present, absent),
+                }
+                for department, present, absent in rows
+                if present or absent
+            ],
+        }
+
+    def department_heatmap(self, date_from: date, date_to: date) -> dict:
+        rollup = DailyAttendanceRollup
+        rows = self.db.execute(
+            select(
+                rollup.department, rollup.date, rollup.present_count, rollup.absent_count
+            ).where(rollup.date >= date_from, rollup.date <= date_to)
+        ).all()
+
+        days = (date_to - date_from).days + 1
+        # Departments whose counts dropped to zero (all employees deleted) are left out
+        departments = sorted(
+            {
+                department
+                for department, _, present_count, absent_count in rows
+                if present_count or absent_count
+            }
+        )
+        row_of = {department: index for index, department in enumerate(departments)}
+        present = [[0] * days for _ in departments]
+        absent = [[0] * days for _ in departments]
+        for department, day, present_count, absent_count in rows:
+            index = row_of.get(department)
+            if index is not None:
+                column = (day - date_from).days
+                present[index][column] = present_count
+                absent[index][column] = absent_count
+
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "departments": departments,
+            "dates": [date_from + timedelta(days=offset) for offset in range(days)],
+            "present": present,
+            "absent": absent,
+            "attendance_rate": [
+                list(map(attendance_rate, present_row, absent_row))
+                for present_row, absent_row in zip(present, absent)
+            ],
+        }
@@ -0,0 +1,165 @@
+"""Awaitable facades over the service layer for ``async def`` endpoints.
+
+The query logic lives once, in the sync services. With an ``AsyncSession``
+(``DB_ASYNC=true``) each call runs through ``AsyncSession.run_sync`` on the event
+loop using the async driver, so an in-flight request holds no thread. With a
+regular ``Session`` the call is pushed to the threadpool, exactly as a sync
+endpoint would be.
+"""
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import date
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.database import is_replica
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.job import Job
+from app.services.analytics_service import AnalyticsService
+from app.services.attendance_service import AttendanceService
+from app.services.attendance_stats_service import (
+    AttendanceStatsService,
+    HISTORY_TABLES,
+    attendance_history_cache,
+    summarize,
+)
+from app.services.dashboard_service import STATS_TABLES, DashboardService, stats_cache
+from app.services.employee_index import employee_index
+from app.services.employee_service import EmployeeService
+from app.services.job_service import JobService
+from app.services.version_service import VersionService, version_cache
+
+
+def _batched(records: Iterator, size: int) -> Iterator[list]:
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+class _AsyncService:
+    def __init__(self, db: Session | AsyncSession):
+        self.db = db
+
+    async def _run(self, call: Callable[[Session], Any]) -> Any:
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(call)
+        return await run_in_threadpool(call, self.db)
+
+
+class AsyncEmployeeService(_AsyncService):
+    async def get_all(self, **filters) -> list[Employee]:
+        return await self._run(lambda db: EmployeeService(db).get_all(**filters))
+
+    async def get_projection(self, fields: list[str], **filters) -> list[dict]:
+        return await self._run(lambda db: EmployeeService(db).get_projection(fields, **filters))
+
+    async def get_by_employee_id(self, employee_id: str) -> Employee | None:
+        return await self._run(lambda db: EmployeeService(db).get_by_employee_id(employee_id))
+
+
+class AsyncAttendanceService(_AsyncService):
+    async def get_all(self, **filters) -> list[Attendance]:
+        return await self._run(lambda db: AttendanceService(db).get_all(**filters))
+
+    async def get_summary(self, **filters) -> dict:
+        return await self._run(lambda db: AttendanceService(db).get_summary(**filters))
+
+    async def get_by_id(self, attendance_id: int) -> Attendance | None:
+        return await self._run(lambda db: AttendanceService(db).get_by_id(attendance_id))
+
+    async def get_by_employee_id(self, employee_id: str) -> list[Attendance]:
+        return await self._run(lambda db: AttendanceService(db).get_by_employee_id(employee_id))
+
+    async def employee_exists(self, employee_id: str) -> bool:
+        # Known employees are confirmed from the in-memory index on the event loop
+        if employee_index.peek_id(employee_id):
+            return True
+        return await self._run(lambda db: AttendanceService(db).employee_exists(employee_id))
+
+    async def iter_batches(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[list[Attendance]]:
+        """Stream matching records in listing order as lists of ``batch_size`` rows."""
+        if isinstance(self.db, AsyncSession):
+            statement = AttendanceService(self.db.sync_session).listing_statement(**filters)
+            result = await self.db.stream_scalars(
+                statement.execution_options(yield_per=batch_size)
+            )
+            async for batch in result.partitions():
+                yield batch
+            return
+
+        records = AttendanceService(self.db).iter_all(batch_size=batch_size, **filters)
+        async for batch in iterate_in_threadpool(_batched(records, batch_size)):
+            yield batch
+
+    async def iter_export_batches(
+        self, batch_size: int = 5000, **filters
+    ) -> AsyncIterator[list[Row]]:
+        """Export rows (plain tuples, no ORM objects) in lists of ``batch_size``."""
+        if isinstance(self.db, AsyncSession):
+            statement = AttendanceService(self.db.sync_session).export_statement(**filters)
+            result = await self.db.stream(statement.execution_options(yield_per=batch_size))
+            async for batch in result.partitions():
+                yield batch
+            return
+
+        batches = AttendanceService(self.db).iter_export_batches(batch_size, **filters)
+        async for batch in iterate_in_threadpool(batches):
+            yield batch
+
+
+class AsyncAttendanceStatsService(_AsyncService):
+    async def get_stats(
+        self, employee_id: str, date_from: date | None = None, date_to: date | None = None
+    ) -> dict | None:
+        # A cached history is summarized in memory without touching the session
+        versions = tuple(version_cache.get(name) for name in HISTORY_TABLES)
+        if None not in versions and not is_replica(self.db):
+            history = attendance_history_cache.get((employee_id, *versions))
+            if history is not None:
+                return summarize(employee_id, history, date_from, date_to)
+        return await self._run(
+            lambda db: AttendanceStatsService(db).get_stats(employee_id, date_from, date_to)
+        )
+
+
+class AsyncAnalyticsService(_AsyncService):
+    async def department_rates(self, date_from: date, date_to: date) -> dict:
+        return await self._run(
+            lambda db: AnalyticsService(db).department_rates(date_from, date_to)
+        )
+
+    async def department_heatmap(self, date_from: date, date_to: date) -> dict:
+        return await self._run(
+            lambda db: AnalyticsService(db).department_heatmap(date_from, date_to)
+        )
+
+
+class AsyncDashboardService(_AsyncService):
+    async def get_stats(self, target_date: date) -> dict:
+        # Cache hits are answered without touching the session or the threadpool
+        versions = tuple(version_cache.get(name) for name in STATS_TABLES)
+        if None not in versions and not is_replica(self.db):
+            cached = stats_cache.get((target_date, *versions))
+            if cached is not None:
+                return cached
+        return await self._run(lambda db: DashboardService(db).get_stats(target_date))
+
+
+class AsyncJobService(_AsyncService):
+    async def get(self, job_id: str) -> Job | None:
+        return await self._run(lambda db: JobService(db).get(job_id))
+
+
+class AsyncVersionService(_AsyncService):
+    async def get(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        cached = tuple(version_cache.get(name) for name in tables)
+        if None not in cached and not is_replica(self.db):
+            return cached
+        return await self._run(lambda db: VersionService(db).get(tables))
@@ -1,26 +1,49 @@
-from datetime import date
+from collections.abc import Iterator
+from datetime import date, datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, func, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
+from app.database import chunked, on_conflict_insert
 from app.models.attendance import Attendance
 from app.models.employee import Employee
-from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
+from app.schemas.attendance import (
+    AttendanceBatchItem,
+    AttendanceCreate,
+    AttendanceUpdate,
+    BulkAttendanceCreate,
+)
+from app.services.employee_index import employee_index
+from app.services.rollup_service import RollupService
+from app.services.version_service import VersionService
+
+# Reads that end up in AttendanceResponse need the employee's name; load it in
+# the same statement instead of lazily once per record
+_WITH_EMPLOYEE_NAME = joinedload(Attendance.employee, innerjoin=True).load_only(
+    Employee.full_name
+)
+
+# Column order of attendance exports
+EXPORT_COLUMNS = ("id", "employee_id", "employee_name", "date", "status", "created_at")
+
+# Attendance has two statuses, so a row whose status changed had the other one
+_OTHER_STATUS = {"Present": "Absent", "Absent": "Present"}
 
 
 class AttendanceService:
     def __init__(self, db: Session):
         self.db = db
+        self.rollup = RollupService(db)
 
-    def get_all(
+    def _apply_filters(
         self,
+        query,
         employee_ids: list[str] | None = None,
         date_from: date | None = None,
         date_to: date | None = None,
         status: str | None = None,
-    ) -> list[Attendance]:
-        query = self.db.query(Attendance)
-
+    ):
         if employee_ids:
             query = query.filter(Attendance.employee_id.in_(employee_ids))
         if date_from:
@@ -29,28 +52,105 @@ class AttendanceService:
             query = query.filter(Attendance.date <= date_to)
         if status:
             query = query.filter(Attendance.status == status)
+        return query
 
-        return query.order_by(Attendance.date.desc(), Attendance.id.desc()).all()
+    def _listing_query(
+        self,
+        employee_ids: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        after: tuple[date, int] | None = None,
+    ):
+        query = self._apply_filters(
+            self.db.query(Attendance).options(_WITH_EMPLOYEE_NAME),
+            employee_ids,
+            date_from,
+            date_to,
+            status,
+        )
+        if after:
+            # Keyset pagination: continue strictly past the last (date, id) seen
+            query = query.filter(tuple_(Attendance.date, Attendance.id) < after)
+        return query.order_by(Attendance.date.desc(), Attendance.id.desc())
 
-    def get_summary(
+    def get_all(
         self,
         employee_ids: list[str] | None = None,
         date_from: date | None = None,
         date_to: date | None = None,
-    ) -> dict:
-        from sqlalchemy import func
+        status: str | None = None,
+        after: tuple[date, int] | None = None,
+        limit: int | None = None,
+    ) -> list[Attendance]:
+        query = self._listing_query(employee_ids, date_from, date_to, status, after)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def listing_statement(
+        self,
+        employee_ids: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+    ) -> Select:
+        """The SELECT behind :meth:`iter_all`, for executing on another session type."""
+        return self._listing_query(employee_ids, date_from, date_to, status).statement
 
-        query = self.db.query(
+    def iter_all(
+        self,
+        employee_ids: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Attendance]:
+        """Stream matching records in listing order, ``batch_size`` rows at a time."""
+        query = self._listing_query(employee_ids, date_from, date_to, status)
+        return iter(query.yield_per(batch_size))
+
+    def export_statement(
+        self,
+        employee_ids: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        status: str | None = None,
+    ) -> Select:
+        """Plain-column SELECT of :data:`EXPORT_COLUMNS`, oldest first, for exports."""
+        query = select(
+            Attendance.id,
+            Attendance.employee_id,
+            Employee.full_name.label("employee_name"),
+            Attendance.date,
             Attendance.status,
-            func.count(Attendance.id).label("count")
+            Attendance.created_at,
+        ).join(Employee, Employee.employee_id == Attendance.employee_id)
+        query = self._apply_filters(query, employee_ids, date_from, date_to, status)
+        return query.order_by(Attendance.date, Attendance.id)
+
+    def iter_export_batches(self, batch_size: int = 5000, **filters) -> Iterator[list[Row]]:
+        """Yield export rows in lists of ``batch_size`` from a server-side cursor."""
+        result = self.db.execute(
+            self.export_statement(**filters).execution_options(yield_per=batch_size)
         )
+        yield from result.partitions()
 
-        if employee_ids:
-            query = query.filter(Attendance.employee_id.in_(employee_ids))
-        if date_from:
-            query = query.filter(Attendance.date >= date_from)
-        if date_to:
-            query = query.filter(Attendance.date <= date_to)
+    def get_summary(
+        self,
+        employee_ids: list[str] | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> dict:
+        if not employee_ids:
+            return self.rollup.get_totals(date_from, date_to)
+
+        query = self._apply_filters(
+            self.db.query(Attendance.status, func.count(Attendance.id).label("count")),
+            employee_ids,
+            date_from,
+            date_to,
+        )
 
         results = query.group_by(Attendance.status).all()
 
@@ -64,11 +164,17 @@ class AttendanceService:
         return summary
 
     def get_by_id(self, attendance_id: int) -> Attendance | None:
-        return self.db.query(Attendance).filter(Attendance.id == attendance_id).first()
+        return (
+            self.db.query(Attendance)
+            .options(_WITH_EMPLOYEE_NAME)
+            .filter(Attendance.id == attendance_id)
+            .first()
+        )
 
     def get_by_employee_id(self, employee_id: str) -> list[Attendance]:
         return (
             self.db.query(Attendance)
+            .options(_WITH_EMPLOYEE_NAME)
             .filter(Attendance.employee_id == employee_id)
             .order_by(Attendance.date.desc())
             .all()
@@ -91,8 +197,17 @@ class AttendanceService:
             date=attendance_data.date,
             status=attendance_data.status.value,
         )
+        department = self.rollup.departments_for([attendance.employee_id]).get(
+            attendance.employee_id
+        )
         try:
             self.db.add(attendance)
+            # Insert (and lock) the attendance row before the rollup row, in the same
+            # order as the other write paths, so concurrent marks cannot deadlock
+            self.db.flush()
+            if department is not None:
+                self.rollup.apply([(attendance.date, department, attendance.status, 1)])
+            VersionService(self.db).bump("attendance")
             self.db.commit()
             self.db.refresh(attendance)
             return attendance
@@ -100,28 +215,296 @@ class AttendanceService:
             self.db.rollback()
             raise
 
+    def create_bulk(self, data: BulkAttendanceCreate) -> tuple[list[dict], list[dict]]:
+        """Mark attendance for many employees on one date in a single transaction.
+
+        Returns ``(created, skipped)``: ``created`` holds one dict per inserted row
+        (including ``employee_name``) and ``skipped`` one ``{"employee_id", "reason"}``
+        dict per employee that was not marked, both in request order.
+        """
+        requested = list(dict.fromkeys(data.employee_ids))
+
+        names = {}
+        departments = {}
+        existing = set()
+        for chunk in chunked(requested):
+            for employee_id, full_name, department in self.db.execute(
+                select(
+                    Employee.employee_id, Employee.full_name, Employee.department
+                ).where(Employee.employee_id.in_(chunk))
+            ):
+                names[employee_id] = full_name
+                departments[employee_id] = department
+            existing.update(
+                self.db.scalars(
+                    select(Attendance.employee_id).where(
+                        Attendance.date == data.date, Attendance.employee_id.in_(chunk)
+                    )
+                )
+            )
+
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                "employee_id": employee_id,
+                "date": data.date,
+                "status": data.status.value,
+                "created_at": created_at,
+            }
+            for employee_id in requested
+            if employee_id in names and employee_id not in existing
+        ]
+
+        inserted = {}
+        if rows:
+            try:
+                result = self.db.execute(self._insert_ignoring_duplicates(), rows)
+                inserted = {row.employee_id: row for row in result}
+                self.rollup.apply(
+                    (data.date, departments[employee_id], data.status.value, 1)
+                    for employee_id in inserted
+                )
+                VersionService(self.db).bump("attendance")
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                raise
+
+        created = []
+        skipped = []
+        seen = set()
+        for employee_id in data.employee_ids:
+            if employee_id not in names:
+                skipped.append({"employee_id": employee_id, "reason": "Employee not found"})
+            elif employee_id in inserted and employee_id not in seen:
+                created.append(
+                    {**inserted[employee_id]._mapping, "employee_name": names[employee_id]}
+                )
+            else:
+                skipped.append(
+                    {"employee_id": employee_id, "reason": "Attendance already marked"}
+                )
+            seen.add(employee_id)
+
+        return created, skipped
+
+    def _insert_ignoring_duplicates(self):
+        """Multi-row INSERT that leaves rows violating ``uq_employee_date`` untouched."""
+        table = Attendance.__table__
+        stmt = on_conflict_insert(self.db, table).on_conflict_do_nothing(
+            index_elements=["employee_id", "date"]
+        )
+        return stmt.returning(
+            table.c.id,
+            table.c.employee_id,
+            table.c.date,
+            table.c.status,
+            table.c.created_at,
+        )
+
     def update(
         self, attendance_id: int, attendance_data: AttendanceUpdate
     ) -> Attendance | None:
-        attendance = self.get_by_id(attendance_id)
-        if not attendance:
-            return None
-        attendance.status = attendance_data.status.value
+        table = Attendance.__table__
+        new_status = attendance_data.status.value
+        try:
+            # A row only comes back if this UPDATE changed its status, so the rollup
+            # moves by what was written rather than by a status read earlier
+            changed = self.db.execute(
+                update(table)
+                .where(table.c.id == attendance_id, table.c.status != new_status)
+                .values(status=new_status)
+                .returning(table.c.employee_id, table.c.date)
+            ).first()
+            if changed is None:
+                self.db.rollback()
+            else:
+                self._commit_status_changes(
+                    [(changed.employee_id, changed.date, new_status, _OTHER_STATUS[new_status])]
+                )
+        except Exception:
+            self.db.rollback()
+            raise
+        return self.get_by_id(attendance_id)
+
+    def _commit_status_changes(self, changes: list[tuple[str, date, str, str | None]]) -> None:
+        """Record ``(employee_id, date, new status, old status or None)`` changes and commit."""
+        if not changes:
+            self.db.commit()
+            return
+        departments = self.rollup.departments_for({change[0] for change in changes})
+        rollup_changes = []
+        for employee_id, day, new_status, old_status in changes:
+            department = departments.get(employee_id)
+            if department is None:
+                continue
+            rollup_changes.append((day, department, new_status, 1))
+            if old_status is not None:
+                rollup_changes.append((day, department, old_status, -1))
+        self.rollup.apply(rollup_changes)
+        VersionService(self.db).bump("attendance")
         self.db.commit()
-        self.db.refresh(attendance)
-        return attendance
 
-    def count_by_date_and_status(self, target_date: date, status: str) -> int:
-        return (
-            self.db.query(Attendance)
-            .filter(Attendance.date == target_date, Attendance.status == status)
-            .count()
+    def update_many(self, items: list[AttendanceBatchItem]) -> list[dict]:
+        """Set the status of existing records, identified by id or (employee_id, date).
+
+        One lookup per chunk finds the records, then one ``UPDATE ... WHERE id IN``
+        per status changes the ones that differ, all in one transaction. When several
+        items target the same record the last one wins. Returns one outcome dict per
+        item, in request order: ``updated``, ``unchanged`` or ``not_found``.
+        """
+        table = Attendance.__table__
+        columns = (table.c.id, table.c.employee_id, table.c.date, table.c.status)
+        ids = list(dict.fromkeys(item.id for item in items if item.id is not None))
+        pairs = list(
+            dict.fromkeys((item.employee_id, item.date) for item in items if item.id is None)
         )
+        by_id = {}
+        by_pair = {}
+        for chunk in chunked(ids):
+            by_id.update(
+                (row.id, row)
+                for row in self.db.execute(select(*columns).where(table.c.id.in_(chunk)))
+            )
+        for chunk in chunked(pairs):
+            by_pair.update(
+                ((row.employee_id, row.date), row)
+                for row in self.db.execute(
+                    select(*columns).where(tuple_(table.c.employee_id, table.c.date).in_(chunk))
+                )
+            )
+
+        records = [
+            by_pair.get((item.employee_id, item.date)) if item.id is None else by_id.get(item.id)
+            for item in items
+        ]
+        targets = {
+            record.id: (record, item.status.value)
+            for record, item in zip(records, items)
+            if record is not None
+        }
+
+        updated = set()
+        try:
+            changes = []
+            for new_status in _OTHER_STATUS:
+                record_ids = [key for key, (_, status) in targets.items() if status == new_status]
+                for chunk in chunked(record_ids):
+                    # Rows that already have the status are left alone, so what the
+                    # UPDATE returns is exactly what changed
+                    for record_id in self.db.scalars(
+                        update(table)
+                        .where(table.c.id.in_(chunk), table.c.status != new_status)
+                        .values(status=new_status)
+                        .returning(table.c.id)
+                    ):
+                        record = targets[record_id][0]
+                        updated.add(record_id)
+                        changes.append(
+                            (record.employee_id, record.date, new_status, _OTHER_STATUS[new_status])
+                        )
+            self._commit_status_changes(changes)
+        except Exception:
+            self.db.rollback()
+            raise
+
+        results = []
+        for item, record in zip(items, records):
+            if record is None:
+                results.append({**item.model_dump(), "outcome": "not_found"})
+                continue
+            results.append(
+                {
+                    "id": record.id,
+                    "employee_id": record.employee_id,
+                    "date": record.date,
+                    "status": targets[record.id][1],
+                    "outcome": "updated" if record.id in updated else "unchanged",
+                }
+            )
+        return results
+
+    def upsert_many(self, items: list[AttendanceCreate]) -> list[dict]:
+        """Create or overwrite attendance for many (employee_id, date) pairs.
+
+        Runs one ``INSERT ... ON CONFLICT DO UPDATE`` in one transaction. The update
+        only fires when the status differs, and new rows carry this call's
+        ``created_at``, so the returned rows tell created from updated records and
+        the rollup stays exact. When several items name the same pair the last one
+        wins. Returns one outcome dict per item, in request order: ``created``,
+        ``updated``, ``unchanged`` or ``not_found`` (unknown employee).
+        """
+        final = {(item.employee_id, item.date): item.status.value for item in items}
+        known = set()
+        for chunk in chunked(list(dict.fromkeys(employee_id for employee_id, _ in final))):
+            known.update(
+                self.db.scalars(
+                    select(Employee.employee_id).where(Employee.employee_id.in_(chunk))
+                )
+            )
+
+        created_at = datetime.utcnow()
+        rows = [
+            {"employee_id": employee_id, "date": day, "status": status, "created_at": created_at}
+            for (employee_id, day), status in final.items()
+            if employee_id in known
+        ]
+        written = {}
+        if rows:
+            table = Attendance.__table__
+            stmt = on_conflict_insert(self.db, table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["employee_id", "date"],
+                set_={"status": stmt.excluded.status},
+                where=table.c.status != stmt.excluded.status,
+            ).returning(table.c.id, table.c.employee_id, table.c.date, table.c.created_at)
+            try:
+                written = {
+                    (row.employee_id, row.date): (row.id, row.created_at == created_at)
+                    for row in self.db.execute(stmt, rows)
+                }
+                changes = []
+                for (employee_id, day), (_, created) in written.items():
+                    status = final[(employee_id, day)]
+                    changes.append(
+                        (employee_id, day, status, None if created else _OTHER_STATUS[status])
+                    )
+                self._commit_status_changes(changes)
+            except Exception:
+                self.db.rollback()
+                raise
+
+        results = []
+        for item in items:
+            key = (item.employee_id, item.date)
+            record_id, created = written.get(key, (None, False))
+            if item.employee_id not in known:
+                outcome = "not_found"
+            elif record_id is None:
+                outcome = "unchanged"
+            else:
+                outcome = "created" if created else "updated"
+            results.append(
+                {
+                    "id": record_id,
+                    "employee_id": item.employee_id,
+                    "date": item.date,
+                    "status": final[key],
+                    "outcome": outcome,
+                }
+            )
+        return results
+
+    def count_by_date_and_status(self, target_date: date, status: str) -> int:
+        totals = self.rollup.get_totals(target_date, target_date)
+        return totals["present" if status == "Present" else "absent"]
 
     def employee_exists(self, employee_id: str) -> bool:
+        if employee_index.has_id(self.db, employee_id):
+            return True
+        # Misses are confirmed against the table: an employee just created by
+        # another worker is only indexed once its version bump is seen
         return (
-            self.db.query(Employee)
-            .filter(Employee.employee_id == employee_id)
-            .first()
+            self.db.scalar(select(Employee.id).where(Employee.employee_id == employee_id))
             is not None
         )
@@ -0,0 +1,198 @@
+from calendar import monthrange
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import is_replica
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.services.version_service import VersionService
+
+# Per-employee attendance history as {year: (present_bits, absent_bits)}, where
+# bit n is day n of the year (0 = January 1st), keyed by (employee_id, attendance
+# version). Attendance writes and employee deletes bump the version, so a write
+# from any worker moves readers to a fresh key, as for the dashboard stats.
+attendance_history_cache = TTLCache(
+    "attendance_history", ttl=settings.ATTENDANCE_STATS_CACHE_TTL
+)
+HISTORY_TABLES = ("attendance",)
+
+YearBits = tuple[int, int]
+
+
+def _day_bit(day: date) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def _span_mask(start: date, end: date) -> int:
+    """Bits for ``start``..``end`` inclusive; both must fall in the same year."""
+    return ((1 << (_day_bit(end) - _day_bit(start) + 1)) - 1) << _day_bit(start)
+
+
+def attendance_rate(present: int, absent: int) -> float | None:
+    """Share of marked days that were Present, to four places; None if none were marked."""
+    marked = present + absent
+    return round(present / marked, 4) if marked else None
+
+
+def _months(start: date, end: date):
+    """(label, first day, last day) for every calendar month touching ``start``..``end``."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        first = max(start, date(year, month, 1))
+        last = min(end, date(year, month, monthrange(year, month)[1]))
+        yield f"{year:04d}-{month:02d}", first, last
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _streaks(history: dict[int, YearBits], start: date, end: date) -> tuple[int, int]:
+    """(current, longest) runs of Present over the marked days in ``start``..``end``.
+
+    Unmarked days (weekends, holidays, days not recorded yet) neither extend nor
+    break a streak; only an Absent day does. The current streak is the run that
+    ends on the latest marked day of the range.
+    """
+    # Marked days in order, packed into one integer: bit i is 1 when the i-th
+    # marked day was Present
+    sequence = 0
+    count = 0
+    for year in range(start.year, end.year + 1):
+        present, absent = history.get(year, (0, 0))
+        window = _span_mask(max(start, date(year, 1, 1)), min(end, date(year, 12, 31)))
+        marked = (present | absent) & window
+        while marked:
+            lowest = marked & -marked
+            if present & lowest:
+                sequence |= 1 << count
+            count += 1
+            marked ^= lowest
+
+    if not count:
+        return 0, 0
+    current = count - (~sequence & ((1 << count) - 1)).bit_length()
+    longest = 0
+    while sequence:
+        sequence &= sequence >> 1
+        longest += 1
+    return current, longest
+
+
+def _recorded_span(history: dict[int, YearBits]) -> tuple[date | None, date | None]:
+    years = sorted(year for year, (present, absent) in history.items() if present | absent)
+    if not years:
+        return None, None
+    first_bits = history[years[0]][0] | history[years[0]][1]
+    last_bits = history[years[-1]][0] | history[years[-1]][1]
+    first = date(years[0], 1, 1) + timedelta(days=(first_bits & -first_bits).bit_length() - 1)
+    last = date(years[-1], 1, 1) + timedelta(days=last_bits.bit_length() - 1)
+    return first, last
+
+
+def summarize(
+    employee_id: str,
+    history: dict[int, YearBits],
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> dict:
+    """Monthly counts, rates and streaks for ``history`` within an optional range."""
+    # Clamp the range to the recorded history so an open or very wide range does
+    # not produce runs of empty months
+    start, end = _recorded_span(history)
+    if start is not None:
+        start = max(start, date_from) if date_from else start
+        end = min(end, date_to) if date_to else end
+    if start is None or start > end:
+        return {
+            "employee_id": employee_id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "present": 0,
+            "absent": 0,
+            "attendance_rate": None,
+            "current_streak": 0,
+            "longest_streak": 0,
+            "months": [],
+        }
+
+    months = []
+    for label, first, last in _months(start, end):
+        present, absent = history.get(first.year, (0, 0))
+        window = _span_mask(first, last)
+        month_present = (present & window).bit_count()
+        month_absent = (absent & window).bit_count()
+        months.append(
+            {
+                "month": label,
+                "present": month_present,
+                "absent": month_absent,
+                "attendance_rate": attendance_rate(month_present, month_absent),
+            }
+        )
+
+    present = sum(month["present"] for month in months)
+    absent = sum(month["absent"] for month in months)
+    current_streak, longest_streak = _streaks(history, start, end)
+    return {
+        "employee_id": employee_id,
+        "date_from": start,
+        "date_to": end,
+        "present": present,
+        "absent": absent,
+        "attendance_rate": attendance_rate(present, absent),
+        "current_streak": current_streak,
+        "longest_streak": longest_streak,
+        "months": months,
+    }
+
+
+class AttendanceStatsService:
+    """Per-employee attendance statistics computed from cached yearly bitsets.
+
+    One indexed range scan on ``uq_employee_date`` loads an employee's whole
+    history (a few hundred bytes per year once packed); any date range is then
+    answered with bit masks and popcounts instead of another query.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_history(self, employee_id: str) -> dict[int, YearBits] | None:
+        """Yearly bitsets for an employee, or ``None`` if the employee does not exist."""
+        # Read before the rows, so the history is at least as new as its key
+        key = (employee_id, *VersionService(self.db).get(HISTORY_TABLES))
+        cached = attendance_history_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = self.db.execute(
+            select(Attendance.date, Attendance.status).where(
+                Attendance.employee_id == employee_id
+            )
+        ).all()
+        if not rows and not self.db.scalar(
+            select(Employee.id).where(Employee.employee_id == employee_id)
+        ):
+            return None
+
+        bits: dict[int, list[int]] = {}
+        for day, status in rows:
+            year = bits.setdefault(day.year, [0, 0])
+            year[0 if status == "Present" else 1] |= 1 << _day_bit(day)
+        history = {year: (present, absent) for year, (present, absent) in bits.items()}
+        if not is_replica(self.db):
+            attendance_history_cache.set(key, history)
+        return history
+
+    def get_stats(
+        self,
+        employee_id: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> dict | None:
+        history = self.get_history(employee_id)
+        if history is None:
+            return None
+        return summarize(employee_id, history, date_from, date_to)
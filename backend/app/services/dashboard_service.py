@@ -0,0 +1,54 @@
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import is_replica
+from app.models.employee import Employee
+from app.models.rollup import DailyAttendanceRollup
+from app.services.version_service import VersionService
+
+# Dashboard stats keyed by (date, employees version, attendance version). Every
+# writer bumps a version, so a committed write from any process (the CLI's rollup
+# rebuild included) moves readers to a fresh key instead of relying on an
+# invalidation reaching each worker's cache.
+stats_cache = TTLCache("dashboard_stats", ttl=settings.DASHBOARD_CACHE_TTL)
+STATS_TABLES = ("employees", "attendance")
+
+
+class DashboardService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stats(self, target_date: date) -> dict:
+        # The versions are read before the counts, so the counts are at least as
+        # new as the key they are stored under
+        key = (target_date, *VersionService(self.db).get(STATS_TABLES))
+        cached = stats_cache.get(key)
+        if cached is not None:
+            return cached
+
+        total_employees = select(func.count(Employee.id)).scalar_subquery()
+        row = self.db.execute(
+            select(
+                total_employees.label("total_employees"),
+                func.coalesce(func.sum(DailyAttendanceRollup.present_count), 0).label(
+                    "present"
+                ),
+                func.coalesce(func.sum(DailyAttendanceRollup.absent_count), 0).label(
+                    "absent"
+                ),
+            ).where(DailyAttendanceRollup.date == target_date)
+        ).one()
+
+        stats = {
+            "total_employees": row.total_employees,
+            "present_today": row.present,
+            "absent_today": row.absent,
+        }
+        # Replica versions may lag the primary's; keep the shared cache primary-only
+        if not is_replica(self.db):
+            stats_cache.set(key, stats)
+        return stats
@@ -0,0 +1,85 @@
+import threading
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import is_replica
+from app.models.employee import Employee
+from app.services.version_service import VersionService, version_cache
+
+
+class EmployeeIndex:
+    """In-process set of employee IDs for O(1) existence checks.
+
+    The index is stamped with the ``employees`` table version it reflects. Writes
+    made through this process update it in place and advance the stamp; a
+    version it did not produce (a write by another worker, visible once the
+    version cache expires) makes the next lookup rebuild it from the table.
+    Lookups through a replica session never rebuild it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: set[str] = set()
+        self._version: int | None = None
+
+    def rebuild(self, db: Session) -> None:
+        version = VersionService(db).get(("employees",))[0]
+        ids = set(db.scalars(select(Employee.employee_id)))
+        with self._lock:
+            self._ids = ids
+            self._version = version
+
+    def reset(self) -> None:
+        """Forget everything; the next lookup rebuilds the index."""
+        with self._lock:
+            self._ids, self._version = set(), None
+
+    def _ensure_current(self, db: Session) -> bool:
+        """Bring the index up to date for ``db``; ``False`` if it cannot answer for it."""
+        if is_replica(db):
+            # A replica's version trails the primary's, so rebuilding from it would
+            # flip the index between the two; only an index current with the
+            # primary is used, and otherwise the replica is asked directly
+            version = version_cache.get("employees")
+            return version is not None and version == self._version
+        if VersionService(db).get(("employees",))[0] != self._version:
+            self.rebuild(db)
+        return True
+
+    def has_id(self, db: Session, employee_id: str) -> bool:
+        if self._ensure_current(db):
+            return employee_id in self._ids
+        return db.scalar(select(Employee.id).where(Employee.employee_id == employee_id)) is not None
+
+    def peek_id(self, employee_id: str) -> bool:
+        """True if a current index holds ``employee_id``, decided without the database.
+
+        ``False`` means "unknown" as well as "absent"; callers fall back to
+        :meth:`has_id` or a query.
+        """
+        version = version_cache.get("employees")
+        return version is not None and version == self._version and employee_id in self._ids
+
+    def record(
+        self,
+        version: int,
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Apply a committed local write that moved ``employees`` to ``version``.
+
+        ``added`` and ``removed`` are employee IDs. If another writer committed in
+        between, the index is left stale and rebuilt lazily.
+        """
+        with self._lock:
+            if self._version is None or self._version != version - 1:
+                self._version = None
+                return
+            self._ids.update(added)
+            self._ids.difference_update(removed)
+            self._version = version
+
+
+employee_index = EmployeeIndex()
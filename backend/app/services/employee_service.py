@@ -1,16 +1,87 @@
+from datetime import datetime
+
+from sqlalchemy import and_, delete, or_, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.database import chunked
 from app.models.employee import Employee
 from app.schemas.employee import EmployeeCreate
+from app.services.employee_index import employee_index
+from app.services.rollup_service import RollupService
+from app.services.version_service import VersionService
+
+# Columns the directory can return through a ``fields=`` projection
+DIRECTORY_FIELDS = (
+    "id",
+    "employee_id",
+    "full_name",
+    "email",
+    "department",
+    "created_at",
+    "updated_at",
+)
+
+
+def _prefix_match(column, prefix: str):
+    # The range bounds let the column's B-tree index serve the lookup; LIKE keeps
+    # the match exact (and case-sensitive, like the bounds) on every dialect.
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper, column.startswith(prefix, autoescape=True))
 
 
 class EmployeeService:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all(self) -> list[Employee]:
-        return self.db.query(Employee).order_by(Employee.created_at.desc()).all()
+    def _directory_query(
+        self,
+        query,
+        department: str | None = None,
+        search: str | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+    ):
+        if department:
+            query = query.filter(Employee.department == department)
+        if search:
+            query = query.filter(
+                or_(
+                    _prefix_match(Employee.employee_id, search),
+                    _prefix_match(Employee.full_name, search),
+                )
+            )
+        if after:
+            query = query.filter(tuple_(Employee.created_at, Employee.id) < after)
+        query = query.order_by(Employee.created_at.desc(), Employee.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    def get_all(
+        self,
+        department: str | None = None,
+        search: str | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+    ) -> list[Employee]:
+        return self._directory_query(
+            self.db.query(Employee), department, search, after, limit
+        ).all()
+
+    def get_projection(
+        self,
+        fields: list[str],
+        department: str | None = None,
+        search: str | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Like :meth:`get_all` but selects only ``fields`` (plus the keyset columns)."""
+        names = dict.fromkeys([*fields, "created_at", "id"])
+        query = self.db.query(*(getattr(Employee, name) for name in names))
+        rows = self._directory_query(query, department, search, after, limit)
+        return [dict(row._mapping) for row in rows]
 
     def get_by_employee_id(self, employee_id: str) -> Employee | None:
         return (
@@ -31,20 +102,48 @@ class EmployeeService:
         )
         try:
             self.db.add(employee)
+            version = VersionService(self.db).bump("employees")["employees"]
             self.db.commit()
-            self.db.refresh(employee)
-            return employee
         except IntegrityError:
             self.db.rollback()
             raise
+        employee_index.record(version, added=[employee_data.employee_id])
+        self.db.refresh(employee)
+        return employee
 
     def delete(self, employee_id: str) -> bool:
-        employee = self.get_by_employee_id(employee_id)
-        if not employee:
-            return False
-        self.db.delete(employee)
-        self.db.commit()
-        return True
+        return bool(self.delete_many([employee_id]))
+
+    def delete_many(self, employee_ids: list[str]) -> list[str]:
+        """Delete employees and their attendance in one transaction.
+
+        Attendance rows are deleted with one statement per chunk, without loading
+        them into the session, and the rollup is decremented by the rows that
+        statement returned. Returns the IDs that existed and were deleted.
+        """
+        employee_ids = list(dict.fromkeys(employee_ids))
+        table = Employee.__table__
+        removed: list[str] = []
+        try:
+            RollupService(self.db).remove_employees(employee_ids)
+            for chunk in chunked(employee_ids):
+                removed.extend(
+                    self.db.scalars(
+                        delete(table)
+                        .where(table.c.employee_id.in_(chunk))
+                        .returning(table.c.employee_id)
+                    )
+                )
+            if not removed:
+                self.db.rollback()
+                return []
+            version = VersionService(self.db).bump("employees", "attendance")["employees"]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        employee_index.record(version, removed=removed)
+        return removed
 
     def count(self) -> int:
         return self.db.query(Employee).count()
@@ -0,0 +1,210 @@
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+
+from pydantic import ValidationError
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.database import chunked, on_conflict_insert
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.schemas.attendance import AttendanceCreate
+from app.schemas.employee import EmployeeCreate
+from app.services.employee_index import employee_index
+from app.services.rollup_service import RollupService
+from app.services.version_service import VersionService
+
+# Per-row errors beyond this are counted in "failed" but not listed
+MAX_REPORTED_ERRORS = 1000
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class ImportService:
+    """Set-based CSV imports of employees and historical attendance.
+
+    Rows are validated with the same schemas as the single-row endpoints, checked
+    for duplicates against the file and the database with one IN query per chunk,
+    and inserted with a multi-row INSERT. Each batch commits on its own, so a bad
+    row is reported (1-based data row number, header excluded) without aborting
+    the rest of the file.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 2000,
+        on_batch: Callable[[dict], None] | None = None,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        # Called with the report after each batch is committed (job progress)
+        self.on_batch = on_batch
+        self.report = {"processed": 0, "created": 0, "failed": 0, "errors": []}
+
+    def _fail(self, row: int, error: str) -> None:
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"row": row, "error": error})
+
+    def _finish(self) -> dict:
+        self.report["errors"].sort(key=lambda error: error["row"])
+        return self.report
+
+    def _batches(self, rows: Iterable[dict]) -> Iterator[list[tuple[int, dict]]]:
+        numbered = enumerate(rows, start=1)
+        while batch := list(islice(numbered, self.batch_size)):
+            self.report["processed"] += len(batch)
+            yield batch
+            if self.on_batch is not None:
+                self.on_batch(self.report)
+
+    def _validate(self, batch, schema) -> list[tuple[int, object]]:
+        valid = []
+        for row, data in batch:
+            try:
+                valid.append((row, schema(**data)))
+            except ValidationError as exc:
+                self._fail(row, _describe(exc))
+        return valid
+
+    def import_employees(self, rows: Iterable[dict]) -> dict:
+        for batch in self._batches(rows):
+            candidates = self._validate(batch, EmployeeCreate)
+            ids = [employee.employee_id for _, employee in candidates]
+            emails = [employee.email for _, employee in candidates]
+
+            taken_ids, taken_emails = set(), set()
+            for chunk in chunked(ids):
+                taken_ids.update(
+                    self.db.scalars(
+                        select(Employee.employee_id).where(Employee.employee_id.in_(chunk))
+                    )
+                )
+            for chunk in chunked(emails):
+                taken_emails.update(
+                    self.db.scalars(select(Employee.email).where(Employee.email.in_(chunk)))
+                )
+
+            now = datetime.utcnow()
+            values = []
+            for row, employee in candidates:
+                if employee.employee_id in taken_ids:
+                    self._fail(row, f"Employee with ID '{employee.employee_id}' already exists")
+                elif employee.email in taken_emails:
+                    self._fail(row, f"Employee with email '{employee.email}' already exists")
+                else:
+                    taken_ids.add(employee.employee_id)
+                    taken_emails.add(employee.email)
+                    values.append(
+                        (row, {**employee.model_dump(), "created_at": now, "updated_at": now})
+                    )
+
+            if values:
+                self._insert_employees(values)
+        return self._finish()
+
+    def _insert_employees(self, values: list[tuple[int, dict]]) -> None:
+        stmt = (
+            on_conflict_insert(self.db, Employee.__table__)
+            .on_conflict_do_nothing()
+            .returning(Employee.__table__.c.employee_id)
+        )
+        try:
+            inserted = set(self.db.scalars(stmt, [value for _, value in values]))
+            version = VersionService(self.db).bump("employees")["employees"]
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        employee_index.record(version, added=inserted)
+
+        self.report["created"] += len(inserted)
+        for row, value in values:
+            if value["employee_id"] not in inserted:
+                # Lost a race with a concurrent insert of the same ID or email
+                self._fail(row, "Employee with this ID or email already exists")
+
+    def import_attendance(self, rows: Iterable[dict]) -> dict:
+        rollup = RollupService(self.db)
+        for batch in self._batches(rows):
+            candidates = self._validate(batch, AttendanceCreate)
+            employee_ids = list(dict.fromkeys(record.employee_id for _, record in candidates))
+            pairs = list(dict.fromkeys((r.employee_id, r.date) for _, r in candidates))
+
+            departments = {}
+            for chunk in chunked(employee_ids):
+                departments.update(rollup.departments_for(chunk))
+            marked = set()
+            for chunk in chunked(pairs):
+                marked.update(
+                    self.db.execute(
+                        select(Attendance.employee_id, Attendance.date).where(
+                            tuple_(Attendance.employee_id, Attendance.date).in_(chunk)
+                        )
+                    ).tuples()
+                )
+
+            now = datetime.utcnow()
+            values = []
+            for row, record in candidates:
+                key = (record.employee_id, record.date)
+                if record.employee_id not in departments:
+                    self._fail(row, f"Employee with ID '{record.employee_id}' not found")
+                elif key in marked:
+                    self._fail(
+                        row,
+                        f"Attendance for employee '{record.employee_id}' on {record.date} "
+                        "already exists",
+                    )
+                else:
+                    marked.add(key)
+                    values.append(
+                        (
+                            row,
+                            {
+                                "employee_id": record.employee_id,
+                                "date": record.date,
+                                "status": record.status.value,
+                                "created_at": now,
+                            },
+                        )
+                    )
+
+            if values:
+                self._insert_attendance(values, departments, rollup)
+        return self._finish()
+
+    def _insert_attendance(
+        self, values: list[tuple[int, dict]], departments: dict, rollup: RollupService
+    ) -> None:
+        table = Attendance.__table__
+        stmt = (
+            on_conflict_insert(self.db, table)
+            .on_conflict_do_nothing(index_elements=["employee_id", "date"])
+            .returning(table.c.employee_id, table.c.date, table.c.status)
+        )
+        try:
+            inserted = self.db.execute(stmt, [value for _, value in values]).all()
+            rollup.apply(
+                (day, departments[employee_id], status, 1)
+                for employee_id, day, status in inserted
+            )
+            VersionService(self.db).bump("attendance")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        self.report["created"] += len(inserted)
+        created = {(employee_id, day) for employee_id, day, _ in inserted}
+        for row, value in values:
+            if (value["employee_id"], value["date"]) not in created:
+                # Lost a race with a concurrent mark for the same employee and date
+                self._fail(row, "Attendance record already exists for this employee and date")
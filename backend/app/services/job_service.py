@@ -0,0 +1,111 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.schemas.job import JobStatus
+
+_QUEUED = (JobStatus.QUEUED.value,)
+_RUNNING = (JobStatus.RUNNING.value,)
+_UNFINISHED = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class JobService:
+    """Status rows of background jobs. Every change commits at once so pollers see it.
+
+    Transitions only apply from the expected status, so a job the sweep already
+    failed is never started, or flipped back to succeeded, by a runner that was
+    merely slow.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, kind: str, owner: str, total: int | None = None) -> Job:
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status=JobStatus.QUEUED.value,
+            total=total,
+            owner=owner,
+        )
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.db.get(Job, job_id)
+
+    def _update(self, job_id: str, statuses: tuple[str, ...], **values) -> bool:
+        """Apply ``values`` if the job is in one of ``statuses``; return whether it was."""
+        result = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_(statuses))
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def start(self, job_id: str) -> bool:
+        return self._update(
+            job_id, _QUEUED, status=JobStatus.RUNNING.value, started_at=datetime.utcnow()
+        )
+
+    def report_progress(self, job_id: str, progress: int) -> bool:
+        return self._update(job_id, _RUNNING, progress=progress)
+
+    def succeed(self, job_id: str, result: Any) -> bool:
+        return self._update(
+            job_id,
+            _RUNNING,
+            status=JobStatus.SUCCEEDED.value,
+            progress=func.coalesce(Job.total, Job.progress),
+            result=jsonable_encoder(result),
+            finished_at=datetime.utcnow(),
+        )
+
+    def fail(self, job_id: str, error: str) -> bool:
+        return self._update(
+            job_id,
+            _UNFINISHED,
+            status=JobStatus.FAILED.value,
+            error=error,
+            finished_at=datetime.utcnow(),
+        )
+
+    def heartbeat(self, owner: str) -> int:
+        """Refresh ``heartbeat_at`` on every unfinished job of ``owner``."""
+        result = self.db.execute(
+            update(Job)
+            .where(Job.owner == owner, Job.status.in_(_UNFINISHED))
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def fail_orphaned(self, stale_seconds: int) -> int:
+        """Fail unfinished jobs whose owner sent no heartbeat for ``stale_seconds``.
+
+        Returns how many were failed.
+        """
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(Job)
+            .where(
+                Job.status.in_(_UNFINISHED),
+                Job.heartbeat_at < now - timedelta(seconds=stale_seconds),
+            )
+            .values(
+                status=JobStatus.FAILED.value,
+                error="Interrupted: the worker running this job stopped",
+                finished_at=now,
+                updated_at=now,
+            )
+        )
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,297 @@
+"""Monthly range partitioning of ``attendance`` on PostgreSQL, and archival of closed years.
+
+Partitioning is opt-in: ``partition_table`` converts the regular table created by
+the migrations into one partitioned by ``date``, with one partition per month and
+a default partition that catches dates no partition covers (back-dated marks).
+Queries keep using the ``attendance`` table, so every service works unchanged and
+date-filtered reads only touch the months they cover.
+
+``archive_year`` replaces a closed year's twelve monthly partitions with a single
+``attendance_archive_<year>`` partition, written in (employee_id, date) order
+without dead tuples and optionally placed on ``ATTENDANCE_ARCHIVE_TABLESPACE``.
+The rows stay in ``attendance``, so listings, exports, per-employee history and
+employee deletes see them as before.
+
+Every operation takes a transaction-level advisory lock, so workers creating next
+month's partitions at startup do not race each other or a running archive job.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+DEFAULT_PARTITION = "attendance_default"
+ARCHIVE_PREFIX = "attendance_archive_"
+
+_BOUNDS = re.compile(r"FROM \('([0-9-]+)'\) TO \('([0-9-]+)'\)")
+_LOCK = "SELECT pg_advisory_xact_lock(hashtext('attendance_partitions'))"
+
+# Recreated on the partitioned table once the rows have been copied, so each
+# partition builds its indexes in one pass
+_PARENT_CONSTRAINTS = (
+    "ALTER TABLE attendance ADD CONSTRAINT attendance_pkey PRIMARY KEY (id, date)",
+    "ALTER TABLE attendance ADD CONSTRAINT uq_employee_date UNIQUE (employee_id, date)",
+    "ALTER TABLE attendance ADD CONSTRAINT attendance_employee_id_fkey "
+    "FOREIGN KEY (employee_id) REFERENCES employees (employee_id) ON DELETE CASCADE",
+    "CREATE INDEX ix_attendance_date_id ON attendance (date, id)",
+    "CREATE INDEX ix_attendance_date_status ON attendance (date, status)",
+)
+
+
+@dataclass
+class Partition:
+    name: str
+    # Half-open [lower, upper) range; both None for the default partition
+    lower: date | None
+    upper: date | None
+
+    @property
+    def archived(self) -> bool:
+        return self.name.startswith(ARCHIVE_PREFIX)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _months_ahead(months: int | None) -> date:
+    """First day of the month ``months`` after this one (the configured default if None)."""
+    if months is None:
+        months = settings.ATTENDANCE_PARTITION_MONTHS_AHEAD
+    month = date.today().replace(day=1)
+    for _ in range(months):
+        month = _next_month(month)
+    return month
+
+
+def _tablespace(name: str) -> str:
+    return f' TABLESPACE "{name}"' if name else ""
+
+
+class PartitionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _require_postgresql(self) -> None:
+        dialect = self.db.get_bind().dialect.name
+        if dialect != "postgresql":
+            raise NotImplementedError(f"Attendance partitioning is not supported on {dialect}")
+
+    def is_partitioned(self) -> bool:
+        self._require_postgresql()
+        relkind = self.db.scalar(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass('attendance')")
+        )
+        return relkind == "p"
+
+    def require_partitioned(self) -> None:
+        if not self.is_partitioned():
+            raise ValueError("attendance is not partitioned; run partition-attendance first")
+
+    def partitions(self) -> list[Partition]:
+        """Partitions of ``attendance`` by ascending range, the default one last."""
+        self._require_postgresql()
+        rows = self.db.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass('attendance')"
+            )
+        ).all()
+        partitions = []
+        for name, bound in rows:
+            match = _BOUNDS.search(bound)
+            if match:
+                partitions.append(
+                    Partition(name, date.fromisoformat(match[1]), date.fromisoformat(match[2]))
+                )
+            else:
+                partitions.append(Partition(name, None, None))
+        return sorted(partitions, key=lambda p: (p.lower is None, p.lower))
+
+    def _attach(
+        self,
+        name: str,
+        lower: date,
+        upper: date,
+        sources: tuple[str, ...] = (),
+        order_by: str = "",
+        tablespace: str = "",
+    ) -> int:
+        """Create ``name`` as the partition for [lower, upper) and return its row count.
+
+        The rows come from ``sources`` (detached tables) plus any the default
+        partition holds for the range; those have to leave the default partition
+        before the range can be attached.
+        """
+        self.db.execute(
+            text(
+                f"CREATE TABLE {name} (LIKE attendance INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                f"{_tablespace(tablespace)}"
+            )
+        )
+        selects = ["SELECT * FROM moved", *(f"SELECT * FROM {source}" for source in sources)]
+        result = self.db.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE date >= '{lower}' AND date < '{upper}' RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM ({' UNION ALL '.join(selects)}) AS source"
+                f"{f' ORDER BY {order_by}' if order_by else ''}"
+            )
+        )
+        self.db.execute(
+            text(
+                f"ALTER TABLE attendance ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            )
+        )
+        return result.rowcount
+
+    def _ensure_months(self, start: date, end: date) -> list[str]:
+        covered = [(p.lower, p.upper) for p in self.partitions() if p.lower is not None]
+        created = []
+        month = start.replace(day=1)
+        while month <= end:
+            following = _next_month(month)
+            if not any(lower < following and month < upper for lower, upper in covered):
+                name = f"attendance_y{month.year}m{month.month:02d}"
+                self._attach(name, month, following)
+                created.append(name)
+            month = following
+        return created
+
+    def partition_table(self, months_ahead: int | None = None) -> list[str]:
+        """Convert ``attendance`` into a partitioned table. Returns the partitions created.
+
+        Runs in one transaction holding an exclusive lock on ``attendance`` while
+        the rows are copied, so schedule it like a migration.
+        """
+        if self.is_partitioned():
+            raise ValueError("attendance is already partitioned")
+        try:
+            self.db.execute(text(_LOCK))
+            self.db.execute(text("LOCK TABLE attendance IN ACCESS EXCLUSIVE MODE"))
+            sequence = self.db.scalar(
+                text("SELECT pg_get_serial_sequence('attendance', 'id')")
+            )
+            first, last = self.db.execute(
+                text("SELECT min(date), max(date) FROM attendance")
+            ).one()
+
+            # Keep the old table's index names free for the partitioned indexes
+            self.db.execute(text("ALTER TABLE attendance RENAME TO attendance_unpartitioned"))
+            for (index,) in self.db.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() "
+                    "AND tablename = 'attendance_unpartitioned'"
+                )
+            ).all():
+                self.db.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}_unpartitioned"'))
+
+            self.db.execute(
+                text(
+                    "CREATE TABLE attendance (LIKE attendance_unpartitioned "
+                    "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)"
+                )
+            )
+            self.db.execute(
+                text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF attendance DEFAULT")
+            )
+
+            end = _months_ahead(months_ahead)
+            created = self._ensure_months(first or date.today(), max(end, last or end))
+
+            self.db.execute(text("INSERT INTO attendance SELECT * FROM attendance_unpartitioned"))
+            if sequence:
+                # The id sequence would otherwise be dropped with the old table
+                self.db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY attendance.id"))
+            self.db.execute(text("DROP TABLE attendance_unpartitioned"))
+            for statement in _PARENT_CONSTRAINTS:
+                self.db.execute(text(statement))
+            self.db.execute(text("ANALYZE attendance"))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [DEFAULT_PARTITION, *created]
+
+    def ensure_months(
+        self, start: date | None = None, months_ahead: int | None = None
+    ) -> list[str]:
+        """Create monthly partitions from ``start`` (this month by default) onward.
+
+        A no-op on an unpartitioned table. Rows that landed in the default
+        partition for a new month are moved into it. Returns the partitions created.
+        """
+        if not self.is_partitioned():
+            return []
+        end = _months_ahead(months_ahead)
+
+        try:
+            self.db.execute(text(_LOCK))
+            created = self._ensure_months(start or date.today(), end)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return created
+
+    def archive_year(self, year: int) -> int:
+        """Merge a closed year into one archive partition. Returns the rows archived.
+
+        Returns 0 when the year is already archived. Reads of ``attendance`` wait
+        while the year's rows are rewritten.
+        """
+        if year >= date.today().year:
+            raise ValueError(f"{year} is not a closed year")
+        self.require_partitioned()
+        lower, upper = date(year, 1, 1), date(year + 1, 1, 1)
+        name = f"{ARCHIVE_PREFIX}{year}"
+
+        try:
+            self.db.execute(text(_LOCK))
+            months = []
+            for partition in self.partitions():
+                if partition.lower is None or partition.upper <= lower or upper <= partition.lower:
+                    continue
+                if partition.name == name:
+                    self.db.rollback()
+                    return 0
+                if partition.lower < lower or upper < partition.upper:
+                    raise ValueError(f"{partition.name} extends beyond {year}")
+                months.append(partition.name)
+
+            for month in months:
+                self.db.execute(text(f"ALTER TABLE attendance DETACH PARTITION {month}"))
+            rows = self._attach(
+                name,
+                lower,
+                upper,
+                sources=tuple(months),
+                order_by="employee_id, date",
+                tablespace=settings.ATTENDANCE_ARCHIVE_TABLESPACE,
+            )
+            for month in months:
+                self.db.execute(text(f"DROP TABLE {month}"))
+            self.db.execute(text(f"ANALYZE {name}"))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return rows
+
+    def archivable_years(self, before: int) -> list[int]:
+        """Years before ``before`` that still have monthly partitions."""
+        self.require_partitioned()
+        return sorted(
+            {
+                p.lower.year
+                for p in self.partitions()
+                if p.lower is not None and not p.archived and p.lower.year < before
+            }
+        )
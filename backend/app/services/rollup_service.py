@@ -0,0 +1,144 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import chunked, on_conflict_insert
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.models.rollup import DailyAttendanceRollup
+from app.services.version_service import VersionService
+
+# (date, department, status, delta) - one entry per attendance row added (+1) or removed (-1)
+RollupChange = tuple[date, str, str, int]
+
+
+class RollupService:
+    """Maintains ``daily_attendance_rollup`` and answers count queries from it.
+
+    Writers call :meth:`apply` inside their own transaction so the rollup commits
+    (or rolls back) together with the attendance rows it describes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def departments_for(self, employee_ids: Iterable[str]) -> dict[str, str]:
+        return dict(
+            self.db.execute(
+                select(Employee.employee_id, Employee.department).where(
+                    Employee.employee_id.in_(list(employee_ids))
+                )
+            ).all()
+        )
+
+    def apply(self, changes: Iterable[RollupChange]) -> None:
+        deltas = defaultdict(lambda: [0, 0])
+        for day, department, status, delta in changes:
+            deltas[(day, department)][0 if status == "Present" else 1] += delta
+
+        rows = [
+            {
+                "date": day,
+                "department": department,
+                "present_count": present,
+                "absent_count": absent,
+            }
+            for (day, department), (present, absent) in deltas.items()
+            if present or absent
+        ]
+        if not rows:
+            return
+
+        table = DailyAttendanceRollup.__table__
+        stmt = on_conflict_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["date", "department"],
+            set_={
+                "present_count": table.c.present_count + stmt.excluded.present_count,
+                "absent_count": table.c.absent_count + stmt.excluded.absent_count,
+            },
+        )
+        self.db.execute(stmt, rows)
+
+    def remove_employees(self, employee_ids: list[str]) -> None:
+        """Delete the attendance of employees that are about to be deleted, and subtract it.
+
+        The employees are locked first (``FOR UPDATE`` on PostgreSQL), which holds
+        off new marks for them until the caller commits, and the deltas come from
+        the rows the DELETE returned, so a status changed meanwhile is subtracted
+        as it was deleted.
+        """
+        table = Attendance.__table__
+        for chunk in chunked(employee_ids):
+            departments = dict(
+                self.db.execute(
+                    select(Employee.employee_id, Employee.department)
+                    .where(Employee.employee_id.in_(chunk))
+                    .with_for_update()
+                ).all()
+            )
+            removed = self.db.execute(
+                delete(table)
+                .where(table.c.employee_id.in_(chunk))
+                .returning(table.c.employee_id, table.c.date, table.c.status)
+            )
+            self.apply(
+                (day, departments[employee_id], status, -1)
+                for employee_id, day, status in removed
+            )
+
+    def rebuild(self, date_from: date | None = None, date_to: date | None = None) -> int:
+        """Recompute the rollup from ``attendance`` for a date range (all dates by default).
+
+        Returns the number of rollup rows written. Bumps the ``attendance`` version,
+        as the dashboard and analytics (and their ETags) read from the rollup.
+        """
+        table = DailyAttendanceRollup.__table__
+        clear = delete(table)
+        source = (
+            select(
+                Attendance.date,
+                Employee.department,
+                func.count(case((Attendance.status == "Present", 1))),
+                func.count(case((Attendance.status == "Absent", 1))),
+            )
+            .join(Employee, Employee.employee_id == Attendance.employee_id)
+            .group_by(Attendance.date, Employee.department)
+        )
+        if date_from:
+            clear = clear.where(table.c.date >= date_from)
+            source = source.where(Attendance.date >= date_from)
+        if date_to:
+            clear = clear.where(table.c.date <= date_to)
+            source = source.where(Attendance.date <= date_to)
+
+        try:
+            self.db.execute(clear)
+            result = self.db.execute(
+                insert(table).from_select(
+                    ["date", "department", "present_count", "absent_count"], source
+                )
+            )
+            VersionService(self.db).bump("attendance")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result.rowcount
+
+    def get_totals(
+        self, date_from: date | None = None, date_to: date | None = None
+    ) -> dict:
+        query = select(
+            func.coalesce(func.sum(DailyAttendanceRollup.present_count), 0),
+            func.coalesce(func.sum(DailyAttendanceRollup.absent_count), 0),
+        )
+        if date_from:
+            query = query.where(DailyAttendanceRollup.date >= date_from)
+        if date_to:
+            query = query.where(DailyAttendanceRollup.date <= date_to)
+        present, absent = self.db.execute(query).one()
+        return {"present": present, "absent": absent}
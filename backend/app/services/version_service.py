@@ -0,0 +1,61 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+from app.config import settings
+from app.database import is_replica, on_conflict_insert
+from app.models.table_version import TableVersion
+
+# Versions keyed by table name. Commits invalidate them; with the memory cache
+# backend, writes made by other workers become visible once the entry expires.
+version_cache = TTLCache("table_versions", ttl=settings.TABLE_VERSION_CACHE_TTL)
+
+
+class VersionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, *tables: str) -> dict[str, int]:
+        """Increment the version of ``tables`` as part of the caller's transaction.
+
+        Returns the new version of each table.
+        """
+        table = TableVersion.__table__
+        stmt = on_conflict_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["table_name"],
+            set_={"version": table.c.version + 1},
+        ).returning(table.c.table_name, table.c.version)
+        versions = dict(
+            self.db.execute(stmt, [{"table_name": name, "version": 1} for name in tables]).all()
+        )
+
+        def invalidate(session):
+            for name in tables:
+                version_cache.invalidate(name)
+
+        # Drop cached versions only once the new ones are visible to other sessions
+        event.listen(self.db, "after_commit", invalidate, once=True)
+        return versions
+
+    def get(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        # A replica's ETag must describe the (possibly older) rows it serves, so
+        # replica sessions read their own versions and never use or fill the cache
+        replica = is_replica(self.db)
+        cached = [None] if replica else [version_cache.get(name) for name in tables]
+        if None not in cached:
+            return tuple(cached)
+
+        generation = version_cache.generation()
+        found = dict(
+            self.db.execute(
+                select(TableVersion.table_name, TableVersion.version).where(
+                    TableVersion.table_name.in_(tables)
+                )
+            ).all()
+        )
+        versions = tuple(found.get(name, 0) for name in tables)
+        if not replica:
+            for name, version in zip(tables, versions):
+                version_cache.set(name, version, since=generation)
+        return versions
@@ -0,0 +1,102 @@
+"""Synthetic company data for benchmarks.
+
+``seed`` drops and recreates every table on the given engine, then fills it with
+``employees`` employees spread over a handful of departments and one attendance row
+per employee per weekday for the last ``years`` years (about 90% Present). The
+rollup is rebuilt afterwards so dashboard and summary reads see the same counts the
+API would have maintained. Data is deterministic for a given size and year count.
+"""
+
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Attendance, Employee
+from app.services.rollup_service import RollupService
+
+DEPARTMENTS = [
+    "Engineering",
+    "Sales",
+    "Marketing",
+    "Finance",
+    "Operations",
+    "Support",
+    "Human Resources",
+    "Legal",
+]
+
+INSERT_BATCH_SIZE = 50_000
+
+
+def employee_id(index: int) -> str:
+    return f"EMP{index:06d}"
+
+
+def working_days(years: int, end: date | None = None) -> list[date]:
+    """Weekdays from ``years`` years before ``end`` (yesterday by default) up to ``end``."""
+    end = end or date.today() - timedelta(days=1)
+    start = end - timedelta(days=365 * years)
+    days = (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+    return [day for day in days if day.weekday() < 5]
+
+
+def _employee_rows(count: int, rng: random.Random) -> list[dict]:
+    joined = datetime.utcnow() - timedelta(days=365 * 5)
+    return [
+        {
+            "employee_id": employee_id(i),
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": rng.choice(DEPARTMENTS),
+            "created_at": joined + timedelta(minutes=i),
+            "updated_at": joined + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def seed(engine, employees: int, years: int) -> dict:
+    """Recreate the schema on ``engine`` and fill it. Returns row counts and timing."""
+    rng = random.Random(f"{employees}-{years}")
+    began = time.perf_counter()
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    days = working_days(years)
+    now = datetime.utcnow()
+    attendance_table = Attendance.__table__
+    with Session(engine) as db:
+        db.execute(insert(Employee.__table__), _employee_rows(employees, rng))
+
+        batch = []
+        for day in days:
+            for i in range(employees):
+                batch.append(
+                    {
+                        "employee_id": employee_id(i),
+                        "date": day,
+                        "status": "Present" if rng.random() < 0.9 else "Absent",
+                        "created_at": now,
+                    }
+                )
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    db.execute(insert(attendance_table), batch)
+                    batch = []
+        if batch:
+            db.execute(insert(attendance_table), batch)
+        db.commit()
+
+        RollupService(db).rebuild()
+
+    return {
+        "employees": employees,
+        "attendance_rows": employees * len(days),
+        "first_day": days[0].isoformat(),
+        "last_day": days[-1].isoformat(),
+        "seed_seconds": round(time.perf_counter() - began, 2),
+    }
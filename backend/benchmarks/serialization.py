@@ -0,0 +1,114 @@
+"""Rows serialized per second for attendance listings, before and after the fast path.
+
+``pydantic`` is the path the attendance router used to take: one ``AttendanceResponse``
+built per row, wrapped in an ``AttendanceList`` and validated again against the
+route's ``response_model`` before being dumped to JSON. ``orjson`` is the current
+path: plain dicts from ``_to_row`` dumped directly by ``_json_response``. ``ndjson``
+is the streaming listing. Rows are synthetic, unsaved ``Attendance`` instances, so no
+database is involved.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization --rows 50000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.models import Attendance, Employee
+from app.routers.attendance import _json_response, _stream_ndjson, _to_row
+from app.schemas.attendance import AttendanceList, AttendanceResponse
+
+_response_model = TypeAdapter(AttendanceList)
+
+
+def _records(count: int) -> list[Attendance]:
+    employees = [
+        Employee(employee_id=f"EMP{i:05d}", full_name=f"Employee {i}") for i in range(500)
+    ]
+    today = date.today()
+    created_at = datetime.utcnow()
+    return [
+        Attendance(
+            id=i,
+            employee_id=employees[i % 500].employee_id,
+            employee=employees[i % 500],
+            date=today - timedelta(days=i // 500),
+            status="Present" if i % 7 else "Absent",
+            created_at=created_at,
+        )
+        for i in range(count)
+    ]
+
+
+def _pydantic(records) -> bytes:
+    listing = AttendanceList(
+        attendance=[AttendanceResponse(**_to_row(r)) for r in records],
+        total=len(records),
+    )
+    return _response_model.dump_json(_response_model.validate_python(listing))
+
+
+def _orjson(records) -> bytes:
+    content = {
+        "attendance": [_to_row(r) for r in records],
+        "total": len(records),
+        "present_count": 0,
+        "absent_count": 0,
+        "next_cursor": None,
+    }
+    return _json_response(content, Response()).body
+
+
+def _ndjson(records) -> bytes:
+    async def batches():
+        for start in range(0, len(records), 1000):
+            yield records[start : start + 1000]
+
+    async def collect():
+        return b"".join([chunk async for chunk in _stream_ndjson(batches())])
+
+    return asyncio.run(collect())
+
+
+PATHS = {"pydantic": _pydantic, "orjson": _orjson, "ndjson": _ndjson}
+
+
+def run(name: str, records, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        body = PATHS[name](records)
+        timings.append(time.perf_counter() - began)
+    best = min(timings)
+    return {
+        "path": name,
+        "rows": len(records),
+        "bytes": len(body),
+        "best_ms": round(best * 1000, 1),
+        "rows_per_second": round(len(records) / best),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = _records(args.rows)
+    reports = [run(name, records, args.repeat) for name in PATHS]
+
+    columns = list(reports[0])
+    print("  ".join(f"{column:>15}" for column in columns))
+    for report in reports:
+        print("  ".join(f"{str(report[column]):>15}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Concurrent attendance-write load test for SQLite, before and after tuning.
+
+Each worker process stands in for one uvicorn worker: it opens its own engine and
+marks attendance through ``AttendanceService.create`` as fast as it can. The run is
+repeated with a plain ``create_engine`` (rollback journal, synchronous=FULL, no
+busy_timeout) and with ``app.database.create_db_engine`` (WAL, synchronous=NORMAL,
+busy_timeout, mmap/cache sizing), and throughput and lock errors are compared.
+
+Run from the backend directory:
+
+    python -m benchmarks.sqlite_write_concurrency --workers 8 --writes 200
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import Base, create_db_engine
+from app.models import Employee
+from app.schemas.attendance import AttendanceCreate, AttendanceStatus
+from app.services.attendance_service import AttendanceService
+
+ENGINE_FACTORIES = {"default": create_engine, "tuned": create_db_engine}
+
+
+def _worker(mode: str, url: str, worker: int, writes: int, start, results) -> None:
+    engine = ENGINE_FACTORIES[mode](url)
+    latencies = []
+    errors = 0
+    start.wait()
+    with Session(engine) as db:
+        service = AttendanceService(db)
+        for i in range(writes):
+            data = AttendanceCreate(
+                employee_id=f"W{worker}",
+                date=date.today() - timedelta(days=i),
+                status=AttendanceStatus.PRESENT if i % 5 else AttendanceStatus.ABSENT,
+            )
+            began = time.perf_counter()
+            try:
+                service.create(data)
+            except OperationalError:
+                db.rollback()
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - began)
+    engine.dispose()
+    results.put((latencies, errors))
+
+
+def run(mode: str, workers: int, writes: int, directory: str) -> dict:
+    path = os.path.join(directory, f"{mode}.db")
+    url = f"sqlite:///{path}"
+    setup_engine = ENGINE_FACTORIES[mode](url)
+    Base.metadata.create_all(setup_engine)
+    with Session(setup_engine) as db:
+        db.add_all(
+            Employee(
+                employee_id=f"W{w}",
+                full_name=f"Worker {w}",
+                email=f"w{w}@example.com",
+                department=f"Dept {w % 3}",
+            )
+            for w in range(workers)
+        )
+        db.commit()
+    setup_engine.dispose()
+
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker, args=(mode, url, w, writes, start, results))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(0.5)
+    began = time.perf_counter()
+    start.set()
+    collected = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - began
+    for process in processes:
+        process.join()
+
+    latencies = sorted(lat for worker_latencies, _ in collected for lat in worker_latencies)
+    succeeded = len(latencies)
+    return {
+        "mode": mode,
+        "writes": succeeded,
+        "lock_errors": sum(errors for _, errors in collected),
+        "seconds": round(elapsed, 3),
+        "writes_per_second": round(succeeded / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": (
+            round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2) if latencies else None
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200, help="writes per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        reports = [run(mode, args.workers, args.writes, directory) for mode in ENGINE_FACTORIES]
+
+    columns = list(reports[0])
+    print("  ".join(f"{column:>17}" for column in columns))
+    for report in reports:
+        print("  ".join(f"{str(report[column]):>17}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Cold-start cost of an API worker: import time and time-to-ready.
+
+``import`` is how long a fresh interpreter takes to import ``app.main``, which is
+what every worker boot and every script importing the app pays. ``ready`` is how
+long a freshly spawned ``uvicorn`` worker takes until ``/health`` answers, so it
+also covers the lifespan hook (engine creation, employee index, partitions).
+
+Each run uses a new process. The database is a scratch SQLite file migrated with
+``alembic upgrade head`` unless ``--database-url`` points elsewhere.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT = (
+    "import time; began = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - began)"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def import_time(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT],
+        cwd=BACKEND,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_to_ready(env: dict, timeout: float) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    began = time.perf_counter()
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=BACKEND,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - began < timeout:
+            if worker.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {worker.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - began
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise TimeoutError(f"worker not ready after {timeout}s")
+    finally:
+        worker.terminate()
+        worker.wait()
+
+
+def _summary(name: str, timings: list[float]) -> dict:
+    return {
+        "measure": name,
+        "runs": len(timings),
+        "best_ms": round(min(timings) * 1000, 1),
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "worst_ms": round(max(timings) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="defaults to a scratch SQLite database")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = args.database_url or (
+            f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        )
+        if not args.database_url:
+            subprocess.run(
+                [sys.executable, "-m", "alembic", "upgrade", "head"],
+                cwd=BACKEND,
+                env=env,
+                check=True,
+                capture_output=True,
+            )
+
+        reports = [
+            _summary("import", [import_time(env) for _ in range(args.repeat)]),
+            _summary("ready", [time_to_ready(env, args.timeout) for _ in range(args.repeat)]),
+        ]
+
+    columns = list(reports[0])
+    print("  ".join(f"{column:>10}" for column in columns))
+    for report in reports:
+        print("  ".join(f"{str(report[column]):>10}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
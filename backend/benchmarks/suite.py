@@ -0,0 +1,758 @@
+"""Latency, throughput and SQL statement counts for every endpoint and service method.
+
+For each database and dataset size the suite seeds a synthetic company (see
+``benchmarks.seed``), then:
+
+* drives every router endpoint in-process through ``httpx.ASGITransport`` with
+  ``--concurrency`` concurrent clients, recording p50/p95/p99 latency and requests
+  per second;
+* calls the service methods behind them directly on a ``Session``;
+* counts the SQL statements each endpoint and method issues (the fewest seen over
+  the sequential warm-up calls), so an N+1 or a lost cache shows up even when
+  latency is noisy.
+
+The results are written as JSON. Passing ``--baseline`` (or running the ``compare``
+command on two reports) lists every target whose p95 latency or statement count
+regressed and exits non-zero if there are any.
+
+Run from the backend directory:
+
+    python -m benchmarks.suite run --sizes 1k,10k --years 1 --output bench.json
+    python -m benchmarks.suite run --databases sqlite,postgresql \\
+        --postgres-url postgresql://localhost/hrms_bench --baseline bench.json
+    python -m benchmarks.suite compare bench.json bench-new.json
+
+PostgreSQL runs drop and recreate every table in ``--postgres-url``; point it at a
+scratch database. The largest combination (100k employees, 5 years) is about 130
+million attendance rows and takes a long time to seed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+import httpx
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_async_db_engine, create_db_engine, get_async_db, get_db
+from app.schemas.attendance import (
+    AttendanceCreate,
+    AttendanceStatus,
+    AttendanceUpdate,
+    BulkAttendanceCreate,
+)
+from app.schemas.employee import EmployeeCreate
+from app.services.analytics_service import AnalyticsService
+from app.services.attendance_service import AttendanceService
+from app.services.attendance_stats_service import (
+    AttendanceStatsService,
+    attendance_history_cache,
+)
+from app.services.dashboard_service import DashboardService, stats_cache
+from app.services.employee_index import employee_index
+from app.services.employee_service import EmployeeService
+from app.services.rollup_service import RollupService
+from app.services.version_service import version_cache
+from benchmarks.seed import DEPARTMENTS, employee_id, seed
+
+BULK_SIZE = 100
+
+
+@dataclass
+class Dataset:
+    employees: int
+    attendance_rows: int
+    first_day: date
+    last_day: date
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+    _write_days: int = 0
+
+    def employee(self, i: int) -> str:
+        return employee_id(i % self.employees)
+
+    def department(self, i: int) -> str:
+        return DEPARTMENTS[i % len(DEPARTMENTS)]
+
+    def attendance_id(self) -> int:
+        return self.rng.randint(1, self.attendance_rows)
+
+    def write_day(self) -> date:
+        """A date before the seeded history that no earlier write has used."""
+        self._write_days += 1
+        return self.first_day - timedelta(days=self._write_days)
+
+
+@dataclass
+class Target:
+    kind: str  # "endpoint" or "service"
+    name: str
+    run: Callable
+    conditional: bool = False
+
+
+def _get(path: str, **params) -> Callable:
+    return lambda data, i: {"method": "GET", "url": path, "params": params}
+
+
+def _endpoint_targets(data: Dataset) -> list[Target]:
+    employee = data.employee(0)
+    last_day = data.last_day.isoformat()
+    week_ago = (data.last_day - timedelta(days=7)).isoformat()
+    year_ago = (data.last_day - timedelta(days=364)).isoformat()
+
+    def endpoint(name, request, **kwargs):
+        return Target("endpoint", name, request, **kwargs)
+
+    return [
+        endpoint("GET /api/v1/employees", _get("/api/v1/employees", limit=50)),
+        endpoint(
+            "GET /api/v1/employees?department",
+            _get("/api/v1/employees", department="Engineering", limit=50),
+        ),
+        endpoint(
+            "GET /api/v1/employees?search",
+            _get("/api/v1/employees", search="EMP0001", limit=50),
+        ),
+        endpoint(
+            "GET /api/v1/employees?fields",
+            _get("/api/v1/employees", fields="employee_id,full_name", limit=1000),
+        ),
+        endpoint(
+            "GET /api/v1/employees/{employee_id}",
+            lambda data, i: {"method": "GET", "url": f"/api/v1/employees/{data.employee(i)}"},
+        ),
+        endpoint("GET /api/v1/attendance", _get("/api/v1/attendance", limit=100)),
+        endpoint(
+            "GET /api/v1/attendance?date_range",
+            _get("/api/v1/attendance", date_from=week_ago, date_to=last_day, limit=100),
+        ),
+        endpoint(
+            "GET /api/v1/attendance?status",
+            _get(
+                "/api/v1/attendance",
+                date_from=last_day,
+                date_to=last_day,
+                status="Absent",
+                limit=100,
+            ),
+        ),
+        endpoint(
+            "GET /api/v1/attendance?format=ndjson",
+            _get("/api/v1/attendance", date_from=last_day, date_to=last_day, format="ndjson"),
+        ),
+        endpoint(
+            "GET /api/v1/attendance/export",
+            _get("/api/v1/attendance/export", date_from=last_day, date_to=last_day),
+        ),
+        endpoint(
+            "GET /api/v1/attendance/{employee_id}",
+            lambda data, i: {"method": "GET", "url": f"/api/v1/attendance/{data.employee(i)}"},
+        ),
+        endpoint(
+            "GET /api/v1/attendance/{employee_id}/stats",
+            lambda data, i: {
+                "method": "GET",
+                "url": f"/api/v1/attendance/{data.employee(i)}/stats",
+            },
+        ),
+        endpoint(
+            "GET /api/v1/attendance/{employee_id} (If-None-Match)",
+            _get(f"/api/v1/attendance/{employee}"),
+            conditional=True,
+        ),
+        endpoint(
+            "GET /api/v1/dashboard/stats", _get("/api/v1/dashboard/stats", today=last_day)
+        ),
+        endpoint(
+            "GET /api/v1/dashboard/stats (If-None-Match)",
+            _get("/api/v1/dashboard/stats", today=last_day),
+            conditional=True,
+        ),
+        endpoint(
+            "GET /api/v1/analytics/departments",
+            _get("/api/v1/analytics/departments", date_from=year_ago, date_to=last_day),
+        ),
+        endpoint(
+            "GET /api/v1/analytics/departments/heatmap",
+            _get("/api/v1/analytics/departments/heatmap", date_from=year_ago, date_to=last_day),
+        ),
+        endpoint(
+            "POST /api/v1/attendance",
+            lambda data, i: {
+                "method": "POST",
+                "url": "/api/v1/attendance",
+                "json": {
+                    "employee_id": data.employee(i),
+                    "date": data.write_day().isoformat(),
+                    "status": "Present",
+                },
+            },
+        ),
+        endpoint(
+            "POST /api/v1/attendance/bulk",
+            lambda data, i: {
+                "method": "POST",
+                "url": "/api/v1/attendance/bulk",
+                "json": {
+                    "employee_ids": [data.employee(i * BULK_SIZE + n) for n in range(BULK_SIZE)],
+                    "date": data.write_day().isoformat(),
+                    "status": "Present",
+                },
+            },
+        ),
+        endpoint(
+            "PATCH /api/v1/attendance",
+            lambda data, i: {
+                "method": "PATCH",
+                "url": "/api/v1/attendance",
+                "json": {
+                    "items": [
+                        {
+                            "id": data.attendance_id(),
+                            "status": "Absent" if (i + n) % 2 else "Present",
+                        }
+                        for n in range(BULK_SIZE)
+                    ]
+                },
+            },
+        ),
+        endpoint(
+            "POST /api/v1/attendance/upsert",
+            lambda data, i: {
+                "method": "POST",
+                "url": "/api/v1/attendance/upsert",
+                "json": {
+                    "items": [
+                        {
+                            "employee_id": data.employee(i * BULK_SIZE + n),
+                            "date": data.last_day.isoformat(),
+                            "status": "Absent" if (i + n) % 2 else "Present",
+                        }
+                        for n in range(BULK_SIZE)
+                    ]
+                },
+            },
+        ),
+        endpoint(
+            "PUT /api/v1/attendance/{id}",
+            lambda data, i: {
+                "method": "PUT",
+                "url": f"/api/v1/attendance/{data.attendance_id()}",
+                "json": {"status": "Absent" if i % 2 else "Present"},
+            },
+        ),
+        endpoint(
+            "POST /api/v1/employees",
+            lambda data, i: {
+                "method": "POST",
+                "url": "/api/v1/employees",
+                "json": {
+                    "employee_id": f"BENCH-E{i}",
+                    "full_name": f"Bench Employee {i}",
+                    "email": f"bench-e{i}@example.com",
+                    "department": data.department(i),
+                },
+            },
+        ),
+        endpoint(
+            "DELETE /api/v1/employees/{employee_id}",
+            lambda data, i: {"method": "DELETE", "url": f"/api/v1/employees/BENCH-E{i}"},
+        ),
+    ]
+
+
+def _service_targets(data: Dataset) -> list[Target]:
+    last_day = data.last_day
+    week_ago = last_day - timedelta(days=7)
+
+    def service(name, call):
+        return Target("service", name, call)
+
+    def uncached_employee_stats(db, data, i):
+        attendance_history_cache.clear()
+        return AttendanceStatsService(db).get_stats(data.employee(i))
+
+    def uncached_stats(db, data, i):
+        stats_cache.clear()
+        return DashboardService(db).get_stats(last_day)
+
+    return [
+        service(
+            "EmployeeService.get_all", lambda db, data, i: EmployeeService(db).get_all(limit=50)
+        ),
+        service(
+            "EmployeeService.get_projection",
+            lambda db, data, i: EmployeeService(db).get_projection(
+                ["employee_id", "full_name"], limit=1000
+            ),
+        ),
+        service(
+            "EmployeeService.get_by_employee_id",
+            lambda db, data, i: EmployeeService(db).get_by_employee_id(data.employee(i)),
+        ),
+        service("EmployeeService.count", lambda db, data, i: EmployeeService(db).count()),
+        service(
+            "AttendanceService.get_all",
+            lambda db, data, i: AttendanceService(db).get_all(
+                date_from=week_ago, date_to=last_day, limit=100
+            ),
+        ),
+        service(
+            "AttendanceService.get_summary",
+            lambda db, data, i: AttendanceService(db).get_summary(
+                date_from=week_ago, date_to=last_day
+            ),
+        ),
+        service(
+            "AttendanceService.get_summary:employees",
+            lambda db, data, i: AttendanceService(db).get_summary(
+                employee_ids=[data.employee(i)], date_from=week_ago, date_to=last_day
+            ),
+        ),
+        service(
+            "AttendanceService.get_by_employee_id",
+            lambda db, data, i: AttendanceService(db).get_by_employee_id(data.employee(i)),
+        ),
+        service(
+            "AttendanceStatsService.get_stats (uncached)", uncached_employee_stats
+        ),
+        service(
+            "AttendanceService.iter_export_batches",
+            lambda db, data, i: sum(
+                len(batch)
+                for batch in AttendanceService(db).iter_export_batches(
+                    date_from=last_day, date_to=last_day
+                )
+            ),
+        ),
+        service(
+            "AttendanceService.count_by_date_and_status",
+            lambda db, data, i: AttendanceService(db).count_by_date_and_status(
+                last_day, "Present"
+            ),
+        ),
+        service("DashboardService.get_stats (uncached)", uncached_stats),
+        service(
+            "AnalyticsService.department_heatmap",
+            lambda db, data, i: AnalyticsService(db).department_heatmap(
+                last_day - timedelta(days=364), last_day
+            ),
+        ),
+        service(
+            "RollupService.get_totals",
+            lambda db, data, i: RollupService(db).get_totals(week_ago, last_day),
+        ),
+        service(
+            "AttendanceService.create",
+            lambda db, data, i: AttendanceService(db).create(
+                AttendanceCreate(
+                    employee_id=data.employee(i),
+                    date=data.write_day(),
+                    status=AttendanceStatus.PRESENT,
+                )
+            ),
+        ),
+        service(
+            "AttendanceService.create_bulk",
+            lambda db, data, i: AttendanceService(db).create_bulk(
+                BulkAttendanceCreate(
+                    employee_ids=[data.employee(i * BULK_SIZE + n) for n in range(BULK_SIZE)],
+                    date=data.write_day(),
+                    status=AttendanceStatus.PRESENT,
+                )
+            ),
+        ),
+        service(
+            "AttendanceService.update",
+            lambda db, data, i: AttendanceService(db).update(
+                data.attendance_id(),
+                AttendanceUpdate(
+                    status=AttendanceStatus.ABSENT if i % 2 else AttendanceStatus.PRESENT
+                ),
+            ),
+        ),
+        service(
+            "EmployeeService.create",
+            lambda db, data, i: EmployeeService(db).create(
+                EmployeeCreate(
+                    employee_id=f"BENCH-S{i}",
+                    full_name=f"Bench Service {i}",
+                    email=f"bench-s{i}@example.com",
+                    department=data.department(i),
+                )
+            ),
+        ),
+        service(
+            "EmployeeService.delete",
+            lambda db, data, i: EmployeeService(db).delete(f"BENCH-S{i}"),
+        ),
+        # Last: removes seeded employees (from the end of the range) with their history
+        service(
+            "EmployeeService.delete:history",
+            lambda db, data, i: EmployeeService(db).delete(data.employee(data.employees - 1 - i)),
+        ),
+    ]
+
+
+class StatementCounter:
+    """Counts statements sent to the given engines inside ``measure()``."""
+
+    def __init__(self, *engines):
+        self.active = False
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.count += 1
+
+    @contextmanager
+    def measure(self):
+        self.count = 0
+        self.active = True
+        try:
+            yield
+        finally:
+            self.active = False
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summarize(target: Target, latencies: list[float], errors: int, elapsed: float, statements):
+    ordered = sorted(latencies)
+    return {
+        "kind": target.kind,
+        "name": target.name,
+        "requests": len(latencies),
+        "errors": errors,
+        "statements": statements,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3) if ordered else None,
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 3) if ordered else None,
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 3) if ordered else None,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+        "throughput_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+async def _run_endpoint(client, target, data, counter, iterations, warmup, concurrency):
+    headers = {}
+    if target.conditional:
+        response = await client.request(**target.run(data, 0))
+        headers["If-None-Match"] = response.headers["etag"]
+
+    async def send(i: int) -> httpx.Response:
+        request = target.run(data, i)
+        return await client.request(**request, headers=headers)
+
+    counts = []
+    for i in range(warmup):
+        with counter.measure():
+            await send(i)
+        counts.append(counter.count)
+    statements = min(counts, default=None)
+
+    latencies, errors = [], 0
+    pending = iter(range(warmup, warmup + iterations))
+
+    async def worker():
+        nonlocal errors
+        for i in pending:
+            began = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - began)
+            if response.status_code >= 400:
+                errors += 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summarize(target, latencies, errors, time.perf_counter() - began, statements)
+
+
+def _run_service(session_factory, target, data, counter, iterations, warmup):
+    counts = []
+    latencies, errors = [], 0
+    with session_factory() as db:
+        for i in range(warmup):
+            with counter.measure():
+                target.run(db, data, i)
+            counts.append(counter.count)
+        statements = min(counts, default=None)
+
+        began = time.perf_counter()
+        for i in range(warmup, warmup + iterations):
+            started = time.perf_counter()
+            try:
+                target.run(db, data, i)
+            except Exception:
+                db.rollback()
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - began
+    return _summarize(target, latencies, errors, elapsed, statements)
+
+
+async def _run_endpoints(engine, async_engine, data, args) -> list[dict]:
+    # Imported here so ``compare`` does not import the whole app
+    from app.main import app
+
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    if async_engine is not None:
+        async_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with async_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+    else:
+        app.dependency_overrides[get_async_db] = override_get_db
+
+    engines = [engine] if async_engine is None else [engine, async_engine.sync_engine]
+    counter = StatementCounter(*engines)
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for target in _endpoint_targets(data):
+                results.append(
+                    await _run_endpoint(
+                        client,
+                        target,
+                        data,
+                        counter,
+                        args.iterations,
+                        args.warmup,
+                        args.concurrency,
+                    )
+                )
+    finally:
+        app.dependency_overrides.clear()
+    return results
+
+
+def _parse_size(value: str) -> int:
+    value = value.strip().lower()
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(value)
+
+
+def _database_urls(args, directory: str) -> dict[str, Callable[[str], str]]:
+    urls = {}
+    for name in args.databases.split(","):
+        name = name.strip()
+        if name == "sqlite":
+            urls[name] = lambda label: f"sqlite:///{os.path.join(directory, label)}.db"
+        elif name == "postgresql":
+            if not args.postgres_url:
+                raise SystemExit("--postgres-url is required to benchmark PostgreSQL")
+            urls[name] = lambda label: args.postgres_url
+        else:
+            raise SystemExit(f"Unsupported database: {name}")
+    return urls
+
+
+def run(args) -> dict:
+    report = {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "config": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "async_db": args.async_db,
+        },
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for database, url_for in _database_urls(args, directory).items():
+            for size in args.sizes.split(","):
+                employees = _parse_size(size)
+                label = f"{size.strip()}-{args.years}y"
+                url = url_for(label)
+                engine = create_db_engine(url)
+                print(f"[{database} {label}] seeding...", file=sys.stderr)
+                seeded = seed(engine, employees, args.years)
+                data = Dataset(
+                    employees=employees,
+                    attendance_rows=seeded["attendance_rows"],
+                    first_day=date.fromisoformat(seeded["first_day"]),
+                    last_day=date.fromisoformat(seeded["last_day"]),
+                )
+                stats_cache.clear()
+                version_cache.clear()
+                attendance_history_cache.clear()
+                employee_index.reset()
+
+                async_engine = create_async_db_engine(url) if args.async_db else None
+                print(f"[{database} {label}] endpoints...", file=sys.stderr)
+                results = asyncio.run(_run_endpoints(engine, async_engine, data, args))
+                if async_engine is not None:
+                    asyncio.run(async_engine.dispose())
+
+                print(f"[{database} {label}] services...", file=sys.stderr)
+                session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+                counter = StatementCounter(engine)
+                for target in _service_targets(data):
+                    results.append(
+                        _run_service(
+                            session_factory, target, data, counter, args.iterations, args.warmup
+                        )
+                    )
+                engine.dispose()
+
+                report["runs"].append(
+                    {"database": database, "dataset": label, **seeded, "results": results}
+                )
+    return report
+
+
+def _index(report: dict) -> dict:
+    return {
+        (run["database"], run["dataset"], result["kind"], result["name"]): result
+        for run in report["runs"]
+        for result in run["results"]
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_ms: float) -> list[dict]:
+    """Targets whose p95 grew by more than ``threshold`` (and ``min_ms``) or that issue
+    more SQL statements than in ``baseline``."""
+    previous = _index(baseline)
+    regressions = []
+    for key, result in _index(current).items():
+        before = previous.get(key)
+        if before is None:
+            continue
+        reasons = []
+        if before["p95_ms"] and result["p95_ms"]:
+            growth = result["p95_ms"] - before["p95_ms"]
+            if growth > min_ms and result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                reasons.append(f"p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if (before["statements"] or 0) < (result["statements"] or 0):
+            reasons.append(f"statements {before['statements']} -> {result['statements']}")
+        if result["errors"] > before["errors"]:
+            reasons.append(f"errors {before['errors']} -> {result['errors']}")
+        if reasons:
+            database, dataset, kind, name = key
+            regressions.append(
+                {
+                    "database": database,
+                    "dataset": dataset,
+                    "kind": kind,
+                    "name": name,
+                    "reasons": reasons,
+                }
+            )
+    return regressions
+
+
+def _print_report(report: dict) -> None:
+    columns = ["statements", "p50_ms", "p95_ms", "p99_ms", "throughput_per_second"]
+    widths = [max(12, len(column) + 2) for column in columns]
+    for run in report["runs"]:
+        print(f"\n{run['database']} {run['dataset']} ({run['attendance_rows']} attendance rows)")
+        print(f"{'name':<56}" + "".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+        for result in run["results"]:
+            print(
+                f"{result['name']:<56}"
+                + "".join(f"{str(result[c]):>{w}}" for c, w in zip(columns, widths))
+            )
+
+
+def _print_regressions(regressions: list[dict]) -> None:
+    if not regressions:
+        print("\nNo regressions against the baseline.")
+        return
+    print(f"\n{len(regressions)} regression(s) against the baseline:")
+    for regression in regressions:
+        print(
+            f"  [{regression['database']} {regression['dataset']}] {regression['name']}: "
+            + "; ".join(regression["reasons"])
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed databases and run the benchmarks")
+    run_parser.add_argument("--sizes", default="1k", help="employee counts, e.g. 1k,10k,100k")
+    run_parser.add_argument("--years", type=int, default=1, help="years of attendance (1-5)")
+    run_parser.add_argument("--databases", default="sqlite", help="sqlite,postgresql")
+    run_parser.add_argument("--postgres-url", help="scratch PostgreSQL database URL")
+    run_parser.add_argument("--iterations", type=int, default=200)
+    run_parser.add_argument("--warmup", type=int, default=5)
+    run_parser.add_argument("--concurrency", type=int, default=4)
+    run_parser.add_argument(
+        "--async-db", action="store_true", help="serve async endpoints from an AsyncSession"
+    )
+    run_parser.add_argument("--output", help="write the JSON report here")
+    run_parser.add_argument("--baseline", help="report to compare against")
+
+    for command_parser in (run_parser, compare_parser := commands.add_parser("compare")):
+        command_parser.add_argument(
+            "--threshold", type=float, default=0.2, help="allowed p95 growth (0.2 = 20%%)"
+        )
+        command_parser.add_argument(
+            "--min-ms", type=float, default=1.0, help="ignore p95 growth below this"
+        )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline) as baseline, open(args.current) as current:
+            regressions = compare(
+                json.load(baseline), json.load(current), args.threshold, args.min_ms
+            )
+        _print_regressions(regressions)
+        sys.exit(1 if regressions else 0)
+
+    if not 1 <= args.years <= 5:
+        parser.error("--years must be between 1 and 5")
+    report = run(args)
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(json.load(baseline), report, args.threshold, args.min_ms)
+        _print_regressions(regressions)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
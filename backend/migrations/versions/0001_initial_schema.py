@@ -0,0 +1,68 @@
+"""Initial schema: employees and attendance
+
+This is the schema previously created by ``Base.metadata.create_all``. A database
+created that way already has both tables; this revision then only records itself,
+so ``alembic upgrade head`` adopts such a database without a manual stamp.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_initial_schema"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("employees") and inspector.has_table("attendance"):
+        return
+
+    op.create_table(
+        "employees",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.String(length=50), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("department", sa.String(length=100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_employees_id", "employees", ["id"])
+    op.create_index("ix_employees_employee_id", "employees", ["employee_id"], unique=True)
+    op.create_index("ix_employees_email", "employees", ["email"], unique=True)
+
+    op.create_table(
+        "attendance",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "employee_id",
+            sa.String(length=50),
+            sa.ForeignKey("employees.employee_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("employee_id", "date", name="uq_employee_date"),
+        sa.CheckConstraint("status IN ('Present', 'Absent')", name="check_status"),
+    )
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+    op.create_index("ix_attendance_employee_id", "attendance", ["employee_id"])
+    op.create_index("ix_attendance_date", "attendance", ["date"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("attendance")
+    op.drop_table("employees")
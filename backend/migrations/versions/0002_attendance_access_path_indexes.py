@@ -0,0 +1,44 @@
+"""Attendance indexes matched to the service query shapes
+
+* ``ix_attendance_date_id`` (date, id) serves listings ordered by date desc, id desc
+  and keyset pagination without a sort.
+* ``ix_attendance_date_status`` (date, status) serves date + status filters and
+  per-day status counts as an index-only scan.
+* Per-employee history (employee_id, date desc) is already served by
+  ``uq_employee_date``, which makes ``ix_attendance_employee_id`` redundant;
+  ``ix_attendance_date`` is a prefix of the new indexes and ``ix_attendance_id``
+  duplicates the primary key.
+
+Revision ID: 0002_attendance_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_attendance_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_initial_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_attendance_date_id", "attendance", ["date", "id"])
+    op.create_index("ix_attendance_date_status", "attendance", ["date", "status"])
+    op.drop_index("ix_attendance_date", table_name="attendance")
+    op.drop_index("ix_attendance_employee_id", table_name="attendance")
+    op.drop_index("ix_attendance_id", table_name="attendance")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+    op.create_index("ix_attendance_employee_id", "attendance", ["employee_id"])
+    op.create_index("ix_attendance_date", "attendance", ["date"])
+    op.drop_index("ix_attendance_date_status", table_name="attendance")
+    op.drop_index("ix_attendance_date_id", table_name="attendance")
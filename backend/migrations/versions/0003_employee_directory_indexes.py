@@ -0,0 +1,45 @@
+"""Employee directory indexes
+
+* ``ix_employees_created_at_id`` (created_at, id) serves the newest-first listing
+  and its keyset pages without a sort.
+* ``ix_employees_department_created_at_id`` serves the same order within a
+  department filter.
+* ``ix_employees_full_name`` serves name prefix search (``employee_id`` prefix
+  search already uses ``ix_employees_employee_id``).
+* ``ix_employees_id`` duplicates the primary key.
+
+Revision ID: 0003_employee_indexes
+Revises: 0002_attendance_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_employee_indexes"
+down_revision: Union[str, Sequence[str], None] = "0002_attendance_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_employees_created_at_id", "employees", ["created_at", "id"])
+    op.create_index(
+        "ix_employees_department_created_at_id",
+        "employees",
+        ["department", "created_at", "id"],
+    )
+    op.create_index("ix_employees_full_name", "employees", ["full_name"])
+    op.drop_index("ix_employees_id", table_name="employees")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_employees_id", "employees", ["id"])
+    op.drop_index("ix_employees_full_name", table_name="employees")
+    op.drop_index("ix_employees_department_created_at_id", table_name="employees")
+    op.drop_index("ix_employees_created_at_id", table_name="employees")
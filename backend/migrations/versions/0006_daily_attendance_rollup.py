@@ -0,0 +1,46 @@
+"""Daily attendance rollup: present/absent counts per day and department
+
+The table is filled from the existing attendance with the same grouped
+``INSERT ... SELECT`` as ``RollupService.rebuild``, so summaries and dashboard
+counts cover the history recorded before the upgrade.
+
+Revision ID: 0006_daily_attendance_rollup
+Revises: 0005_jobs
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_daily_attendance_rollup"
+down_revision: Union[str, Sequence[str], None] = "0005_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_attendance_rollup",
+        sa.Column("date", sa.Date(), primary_key=True),
+        sa.Column("department", sa.String(length=100), primary_key=True),
+        sa.Column("present_count", sa.Integer(), nullable=False),
+        sa.Column("absent_count", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO daily_attendance_rollup (date, department, present_count, absent_count) "
+        "SELECT a.date, e.department, "
+        "count(CASE WHEN a.status = 'Present' THEN 1 END), "
+        "count(CASE WHEN a.status = 'Absent' THEN 1 END) "
+        "FROM attendance a JOIN employees e ON e.employee_id = a.employee_id "
+        "GROUP BY a.date, e.department"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_attendance_rollup")
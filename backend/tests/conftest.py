@@ -0,0 +1,51 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read when app.config is imported, so point them at a scratch
+# database before any test module imports the app
+_DIRECTORY = tempfile.mkdtemp(prefix="hrms-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORY, 'test.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["DB_ASYNC"] = "false"
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import create_db_engine  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# PostgreSQL-only checks run against this scratch database, whose public schema
+# they drop; they are skipped when it is not set
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def migrate() -> None:
+    command.upgrade(Config(str(BACKEND / "alembic.ini")), "head")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    migrate()
+
+
+@pytest.fixture(scope="module")
+def postgres_engine():
+    """An engine on ``TEST_POSTGRES_URL`` with a freshly migrated, empty schema."""
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_db_engine(POSTGRES_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    # migrations/env.py takes the URL from the settings
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "DATABASE_URL", POSTGRES_URL)
+        migrate()
+    yield engine
+    engine.dispose()
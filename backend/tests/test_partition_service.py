@@ -0,0 +1,114 @@
+"""PartitionService against a real PostgreSQL database.
+
+Partitioning is PostgreSQL-only, so these tests run only when
+``TEST_POSTGRES_URL`` points at a scratch database. Everything in its ``public``
+schema is dropped first:
+
+    TEST_POSTGRES_URL=postgresql+psycopg2://localhost/hrms_test \
+        python -m pytest tests/test_partition_service.py
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+from app.services.partition_service import DEFAULT_PARTITION, PartitionService
+
+# Three months of a closed year; partition_table covers them and every month since
+SEEDED_MONTHS = (date(2023, 3, 1), date(2023, 4, 1), date(2023, 5, 1))
+EMPLOYEES = 4
+
+
+@pytest.fixture(scope="module")
+def db(postgres_engine):
+    with Session(postgres_engine) as session:
+        for number in range(EMPLOYEES):
+            employee_id = f"PT-{number}"
+            session.add(
+                Employee(
+                    employee_id=employee_id,
+                    full_name=employee_id,
+                    email=f"pt-{number}@example.com",
+                    department="Engineering",
+                )
+            )
+            session.add_all(
+                Attendance(employee_id=employee_id, date=month, status="Present")
+                for month in (*SEEDED_MONTHS, date.today())
+            )
+        session.commit()
+        yield session
+
+
+def count(db: Session, table: str, where: str = "") -> int:
+    return db.scalar(text(f"SELECT count(*) FROM {table} {where}"))
+
+
+def partition_of(db: Session, day: date) -> str:
+    return db.scalar(
+        text("SELECT tableoid::regclass::text FROM attendance WHERE date = :day LIMIT 1"),
+        {"day": day},
+    )
+
+
+def test_partition_table(db):
+    service = PartitionService(db)
+    created = service.partition_table(months_ahead=1)
+
+    assert service.is_partitioned()
+    assert created[0] == DEFAULT_PARTITION
+    assert "attendance_y2023m03" in created and "attendance_y2023m12" in created
+    assert count(db, "attendance") == EMPLOYEES * (len(SEEDED_MONTHS) + 1)
+    assert count(db, DEFAULT_PARTITION) == 0
+    assert partition_of(db, date(2023, 4, 1)) == "attendance_y2023m04"
+
+    # The id sequence survived the swap, so the ORM can still insert
+    db.add(Attendance(employee_id="PT-0", date=date(2023, 6, 2), status="Absent"))
+    db.commit()
+    assert partition_of(db, date(2023, 6, 2)) == "attendance_y2023m06"
+
+
+def test_ensure_months_moves_rows_out_of_the_default_partition(db):
+    service = PartitionService(db)
+    back_dated = date(2022, 6, 15)
+    db.add(Attendance(employee_id="PT-1", date=back_dated, status="Present"))
+    db.commit()
+    assert partition_of(db, back_dated) == DEFAULT_PARTITION
+
+    created = service.ensure_months(date(2022, 6, 1), months_ahead=1)
+
+    assert created[0] == "attendance_y2022m06"
+    assert "attendance_y2023m03" not in created
+    assert count(db, DEFAULT_PARTITION) == 0
+    assert partition_of(db, back_dated) == "attendance_y2022m06"
+    assert service.ensure_months(date(2022, 6, 1), months_ahead=1) == []
+
+
+def test_archive_year(db):
+    service = PartitionService(db)
+    total = count(db, "attendance")
+    in_2023 = count(db, "attendance", "WHERE date >= '2023-01-01' AND date < '2024-01-01'")
+
+    assert service.archivable_years(before=2024) == [2022, 2023]
+    assert service.archive_year(2023) == in_2023
+
+    partitions = {p.name: p for p in service.partitions()}
+    assert not any(name.startswith("attendance_y2023") for name in partitions)
+    archive = partitions["attendance_archive_2023"]
+    assert (archive.lower, archive.upper) == (date(2023, 1, 1), date(2024, 1, 1))
+    assert archive.archived
+    assert count(db, "attendance") == total
+    assert partition_of(db, date(2023, 4, 1)) == "attendance_archive_2023"
+
+    assert service.archive_year(2023) == 0
+    with pytest.raises(ValueError):
+        service.archive_year(date.today().year)
+
+    # The employees FK still cascades into every partition, archived ones included
+    db.execute(text("DELETE FROM employees WHERE employee_id = 'PT-0'"))
+    db.commit()
+    assert count(db, "attendance", "WHERE employee_id = 'PT-0'") == 0
@@ -0,0 +1,84 @@
+"""The attendance listings issue the same number of SQL statements at any size.
+
+A lazy load or a per-row lookup slipping into either endpoint would make the
+count grow with the number of records returned.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.main import app
+from app.models.attendance import Attendance
+from app.models.employee import Employee
+
+SMALL = 3
+LARGE = 60
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        with database.SessionLocal() as db:
+            for employee_id, days in (("QC-WARM", 1), ("QC-SMALL", SMALL), ("QC-LARGE", LARGE)):
+                db.add(
+                    Employee(
+                        employee_id=employee_id,
+                        full_name=employee_id,
+                        email=f"{employee_id.lower()}@example.com",
+                        department="Engineering",
+                    )
+                )
+                db.add_all(
+                    Attendance(
+                        employee_id=employee_id,
+                        date=date(2024, 1, 1) + timedelta(days=day),
+                        status="Present" if day % 3 else "Absent",
+                    )
+                    for day in range(days)
+                )
+            db.commit()
+        yield client
+
+
+def count_statements(client: TestClient, url: str, **params) -> tuple[int, dict]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(database.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url, params=params)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+@pytest.mark.parametrize(
+    "url, params",
+    [
+        ("/api/v1/attendance", {"employee_ids": "{employee_id}"}),
+        ("/api/v1/attendance/{employee_id}", {}),
+    ],
+)
+def test_statement_count_does_not_grow_with_rows(client, url, params):
+    def request(employee_id):
+        return count_statements(
+            client,
+            url.format(employee_id=employee_id),
+            **{name: value.format(employee_id=employee_id) for name, value in params.items()},
+        )
+
+    # Fill the version cache and employee index so both measured requests start warm
+    request("QC-WARM")
+    small_count, small = request("QC-SMALL")
+    large_count, large = request("QC-LARGE")
+
+    assert small["total"] == SMALL
+    assert large["total"] == LARGE
+    assert large_count == small_count
@@ -0,0 +1,30 @@
+"""Every service query is served by an index, on SQLite and on PostgreSQL.
+
+Runs ``check_query_plans`` (the ``check-indexes`` command) against the migrated
+test database, and against ``TEST_POSTGRES_URL`` when it is set, so dropping or
+reshaping an index that a hot query relies on fails the suite.
+"""
+
+from sqlalchemy.orm import Session
+
+from app import database
+from app.query_plans import check_query_plans
+
+
+def assert_uses_indexes(db: Session) -> None:
+    plans = check_query_plans(db)
+    assert plans
+    full_scans = {plan.name: plan.plan for plan in plans if not plan.uses_index}
+    assert not full_scans
+
+
+def test_sqlite_query_plans():
+    database.init_engines()
+    with database.SessionLocal() as db:
+        assert db.get_bind().dialect.name == "sqlite"
+        assert_uses_indexes(db)
+
+
+def test_postgresql_query_plans(postgres_engine):
+    with Session(postgres_engine) as db:
+        assert_uses_indexes(db)